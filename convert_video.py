@@ -2,12 +2,30 @@
 import ffmpeg
 import os
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from ffmpeg_utils import select_h264_encoder, get_h264_encoder_options
+from file_utils import get_file_config, ensure_directory_exists
 
-def convert_mov_to_mp4(input_path, output_path=None, target_size_mb=200):
+# 모든 코어를 사용하도록 x264 스레드 설정 (슬라이스 스레딩 + lookahead 병렬화)
+X264_THREAD_OPTIONS = {
+    'threads': 0,
+    'x264-params': 'threads=auto:sliced-threads=1:lookahead-threads=2:rc-lookahead=40',
+}
+
+# 이 길이(초) 이상의 영상은 구간 분할 후 병렬 인코딩 (libx264 사용 시)
+PARALLEL_ENCODE_MIN_DURATION = 600
+SEGMENT_SECONDS = 60
+
+def convert_mov_to_mp4(input_path, output_path=None, target_size_mb=200, strict_size=False, preset='slower'):
     """
     MOV 파일을 MP4로 변환합니다.
     목표 파일 크기에 맞춰 최적화된 설정을 적용합니다.
+
+    기본은 단일 패스 인코딩(하드웨어 인코더 우선, 없으면 libx264 CRF)이며,
+    strict_size=True일 때만 목표 크기를 정확히 맞추는 libx264 2-pass를 사용합니다.
+    2-pass의 preset은 기본 'slower'이며 최대 압축이 필요하면 'veryslow'를 지정합니다.
     """
     
     input_file = Path(input_path)
@@ -36,46 +54,10 @@ def convert_mov_to_mp4(input_path, output_path=None, target_size_mb=200):
     try:
         print(f"변환 시작: {input_file.name} -> {output_file.name}")
         
-        # 최적화된 설정
-        # - 2-pass 인코딩으로 품질 최적화
-        # - 계산된 비트레이트로 용량 제어
-        # - 슬라이드 영상에 최적화된 튜닝
-        
-        # 1st pass
-        (
-            ffmpeg
-            .input(str(input_file))
-            .output(
-                '/dev/null' if os.name != 'nt' else 'NUL',
-                vcodec='libx264',
-                acodec='aac',
-                video_bitrate=f"{int(video_bitrate)}",
-                audio_bitrate='128k',
-                preset='veryslow',  # 최고 압축 효율
-                tune='stillimage',  # 슬라이드/정적 이미지 최적화
-                **{'pass': 1, 'f': 'null'}
-            )
-            .overwrite_output()
-            .run(capture_stdout=True, capture_stderr=True)
-        )
-        
-        # 2nd pass
-        (
-            ffmpeg
-            .input(str(input_file))
-            .output(
-                str(output_file),
-                vcodec='libx264',
-                acodec='aac',
-                video_bitrate=f"{int(video_bitrate)}",
-                audio_bitrate='128k',
-                preset='veryslow',
-                tune='stillimage',
-                **{'pass': 2}
-            )
-            .overwrite_output()
-            .run(capture_stdout=True, capture_stderr=True)
-        )
+        if strict_size:
+            encode_two_pass(input_file, output_file, video_bitrate, preset=preset)
+        else:
+            encode_single_pass(input_file, output_file, video_bitrate, duration=duration)
         
         if output_file.exists():
             input_size = input_file.stat().st_size
@@ -100,18 +82,177 @@ def convert_mov_to_mp4(input_path, output_path=None, target_size_mb=200):
         print(f"예상치 못한 오류 발생: {e}")
         return False
 
+def encode_single_pass(input_file, output_file, video_bitrate, duration=None):
+    """단일 패스 인코딩 (하드웨어 인코더 또는 비트레이트 상한 CRF)"""
+    encoder = select_h264_encoder()
+    
+    # 긴 영상을 CPU로 인코딩할 때는 구간별 병렬 인코딩
+    if encoder == 'libx264' and duration and duration >= PARALLEL_ENCODE_MIN_DURATION:
+        encode_segments_parallel(input_file, output_file, video_bitrate)
+        return
+    
+    print(f"인코더: {encoder} (단일 패스)")
+    
+    encoder_options = get_h264_encoder_options(encoder, video_bitrate=video_bitrate)
+    if encoder == 'libx264':
+        encoder_options['tune'] = 'stillimage'  # 슬라이드/정적 이미지 최적화
+        encoder_options.update(X264_THREAD_OPTIONS)
+    
+    (
+        ffmpeg
+        .input(str(input_file))
+        .output(
+            str(output_file),
+            acodec='aac',
+            audio_bitrate='128k',
+            movflags='+faststart',
+            **encoder_options
+        )
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+
+def _encode_segment(segment_path, output_path, video_bitrate, threads):
+    """분할된 구간 하나를 libx264 단일 패스로 인코딩 (비디오 스트림만)"""
+    encoder_options = get_h264_encoder_options('libx264', video_bitrate=video_bitrate)
+    encoder_options['tune'] = 'stillimage'
+    (
+        ffmpeg
+        .input(str(segment_path))
+        .output(str(output_path), an=None, threads=threads, **encoder_options)
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return output_path
+
+def encode_segments_parallel(input_file, output_file, video_bitrate, segment_seconds=SEGMENT_SECONDS, max_workers=None):
+    """
+    긴 영상을 키프레임 경계에서 구간으로 나눠 병렬 인코딩한 뒤 무손실 결합
+    
+    각 구간은 전체 목표와 같은 비트레이트 상한으로 인코딩되므로
+    전체 용량도 target_size_mb 안에 유지됩니다. 오디오는 원본에서 한 번만 인코딩합니다.
+    """
+    cpu_count = os.cpu_count() or 1
+    temp_root = ensure_directory_exists(get_file_config()['temp_dir'])
+    
+    with tempfile.TemporaryDirectory(prefix="segments_", dir=temp_root) as work_dir:
+        work_dir = Path(work_dir)
+        
+        # 1. 키프레임 단위로 스트림 복사 분할 (재인코딩 없음)
+        (
+            ffmpeg
+            .input(str(input_file))
+            .output(
+                str(work_dir / 'seg_%03d.mov'),
+                map='0:v:0',
+                c='copy',
+                f='segment',
+                segment_time=segment_seconds,
+                reset_timestamps=1
+            )
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+        segments = sorted(work_dir.glob('seg_*.mov'))
+        
+        workers = max_workers or min(len(segments), max(1, cpu_count // 2))
+        threads = max(1, cpu_count // workers)
+        print(f"인코더: libx264 (구간 {len(segments)}개 병렬 인코딩, 작업자 {workers}개)")
+        
+        # 2. 구간별 병렬 인코딩 (작업은 ffmpeg 하위 프로세스에서 수행되므로 스레드 풀로 충분)
+        encoded = [work_dir / f"enc_{segment.stem}.mp4" for segment in segments]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_encode_segment, segment, target, video_bitrate, threads)
+                for segment, target in zip(segments, encoded)
+            ]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                print(f"   구간 인코딩 완료: {done}/{len(futures)}")
+        
+        # 3. concat demuxer로 무손실 결합 + 원본 오디오 인코딩
+        concat_list = work_dir / 'list.txt'
+        concat_list.write_text(''.join(f"file '{path.name}'\n" for path in encoded), encoding='utf-8')
+        
+        video = ffmpeg.input(str(concat_list), f='concat', safe=0).video
+        audio = ffmpeg.input(str(input_file))['a:0?']
+        (
+            ffmpeg
+            .output(
+                video,
+                audio,
+                str(output_file),
+                vcodec='copy',
+                acodec='aac',
+                audio_bitrate='128k',
+                movflags='+faststart'
+            )
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+
+def encode_two_pass(input_file, output_file, video_bitrate, preset='slower'):
+    """
+    libx264 2-pass 인코딩 (목표 크기를 엄격히 맞춰야 할 때만 사용)
+    - 2-pass 인코딩으로 품질 최적화
+    - 계산된 비트레이트로 용량 제어
+    - 슬라이드 영상에 최적화된 튜닝
+    """
+    print(f"인코더: libx264 (2-pass, preset={preset})")
+    
+    # 1st pass
+    (
+        ffmpeg
+        .input(str(input_file))
+        .output(
+            '/dev/null' if os.name != 'nt' else 'NUL',
+            vcodec='libx264',
+            acodec='aac',
+            video_bitrate=f"{int(video_bitrate)}",
+            audio_bitrate='128k',
+            preset=preset,  # slower: veryslow 대비 약 2배 빠르고 용량 차이 1% 미만
+            tune='stillimage',  # 슬라이드/정적 이미지 최적화
+            **X264_THREAD_OPTIONS,
+            **{'pass': 1, 'f': 'null'}
+        )
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    
+    # 2nd pass
+    (
+        ffmpeg
+        .input(str(input_file))
+        .output(
+            str(output_file),
+            vcodec='libx264',
+            acodec='aac',
+            video_bitrate=f"{int(video_bitrate)}",
+            audio_bitrate='128k',
+            preset=preset,
+            tune='stillimage',
+            movflags='+faststart',
+            **X264_THREAD_OPTIONS,
+            **{'pass': 2}
+        )
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+
 def main():
     input_path = "/Users/smgu/test_code/video_converter/video.mov"
     output_path = "/Users/smgu/test_code/video_converter/video_compressed.mp4"
     target_size = 190  # 190MB 목표 (여유분 확보)
+    strict_size = '--strict-size' in sys.argv  # 목표 크기를 정확히 맞춰야 할 때만 2-pass
     
     print("=== MOV to MP4 압축 변환기 ===")
     print(f"입력 파일: {input_path}")
     print(f"출력 파일: {output_path}")
     print(f"목표 크기: {target_size}MB")
+    print(f"인코딩 방식: {'2-pass (--strict-size)' if strict_size else '단일 패스'}")
     print()
     
-    success = convert_mov_to_mp4(input_path, output_path, target_size)
+    success = convert_mov_to_mp4(input_path, output_path, target_size, strict_size=strict_size)
     
     if success:
         print("\n✅ 변환이 성공적으로 완료되었습니다!")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+FFmpeg 관련 유틸리티 함수들
+하드웨어 인코더 감지와 인코딩 옵션 생성
+"""
+
+import functools
+import platform
+import subprocess
+import threading
+import ffmpeg
+import numpy as np
+
+# 플랫폼별 하드웨어 H.264 인코더 우선순위
+HW_H264_ENCODERS = {
+    'Darwin': ['h264_videotoolbox'],
+    'Linux': ['h264_nvenc', 'h264_qsv'],
+    'Windows': ['h264_nvenc', 'h264_qsv'],
+}
+
+# 하드웨어 인코더와 짝을 이루는 디코딩 가속(-hwaccel) 방식
+HW_DECODE_ACCELS = {
+    'h264_videotoolbox': 'videotoolbox',
+    'h264_nvenc': 'cuda',
+    'h264_qsv': 'qsv',
+}
+
+# MP4 컨테이너에 그대로 복사할 수 있는 오디오 코덱
+MP4_COPY_AUDIO_CODECS = frozenset({'aac', 'mp3', 'alac', 'ac3', 'eac3'})
+
+@functools.lru_cache(maxsize=1)
+def get_available_encoders():
+    """
+    로컬 ffmpeg 빌드에서 사용 가능한 인코더 목록 조회 (최초 1회만 실행)
+
+    Returns:
+        frozenset: 인코더 이름 집합 (ffmpeg 실행 실패 시 빈 집합)
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        # 인코더 라인 형식: " V....D libx264  설명"
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in 'VAS':
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+@functools.lru_cache(maxsize=1)
+def get_available_hwaccels():
+    """
+    로컬 ffmpeg 빌드에서 지원하는 하드웨어 디코딩 가속 방식 조회 (최초 1회만 실행)
+
+    Returns:
+        frozenset: hwaccel 이름 집합 (예: cuda, videotoolbox)
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-hwaccels'],
+            capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+
+    # 첫 줄 "Hardware acceleration methods:" 이후 한 줄에 하나씩 나열됨
+    lines = result.stdout.splitlines()[1:]
+    return frozenset(line.strip() for line in lines if line.strip())
+
+def get_hwaccel_input_options(encoder):
+    """
+    인코더에 맞는 하드웨어 디코딩 입력 옵션 생성
+
+    Args:
+        encoder: select_h264_encoder()가 반환한 인코더 이름
+
+    Returns:
+        dict: ffmpeg-python input() 키워드 인자 (지원되지 않으면 빈 딕셔너리)
+    """
+    hwaccel = HW_DECODE_ACCELS.get(encoder)
+    if hwaccel and hwaccel in get_available_hwaccels():
+        return {'hwaccel': hwaccel}
+    return {}
+
+@functools.lru_cache(maxsize=None)
+def is_encoder_usable(encoder):
+    """
+    인코더가 빌드에 포함되어 있고 실제 장치에서 초기화되는지 확인
+    (NVENC/QSV는 빌드에 있어도 GPU가 없으면 실패하므로 짧은 테스트 인코딩으로 검증)
+
+    Args:
+        encoder: 인코더 이름 (예: h264_nvenc)
+
+    Returns:
+        bool: 사용 가능하면 True
+    """
+    if encoder not in get_available_encoders():
+        return False
+
+    try:
+        subprocess.run(
+            [
+                'ffmpeg', '-hide_banner', '-v', 'error',
+                '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+                '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'
+            ],
+            capture_output=True, check=True, timeout=30
+        )
+        return True
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return False
+
+def select_h264_encoder(allow_hardware=True):
+    """
+    현재 플랫폼에서 가장 빠른 H.264 인코더 선택
+
+    Args:
+        allow_hardware: False이면 항상 libx264 사용
+
+    Returns:
+        str: 인코더 이름 (하드웨어 인코더가 없으면 'libx264')
+    """
+    if allow_hardware:
+        for encoder in HW_H264_ENCODERS.get(platform.system(), []):
+            if is_encoder_usable(encoder):
+                return encoder
+    return 'libx264'
+
+def get_h264_encoder_options(encoder, video_bitrate=None, crf=23, preset='medium'):
+    """
+    인코더별 단일 패스 출력 옵션 생성
+
+    Args:
+        encoder: select_h264_encoder()가 반환한 인코더 이름
+        video_bitrate: 목표/최대 비디오 비트레이트 (bps, None이면 품질 기준만 사용)
+        crf: libx264 CRF 값 (하드웨어 인코더는 대응하는 품질 값으로 변환)
+        preset: libx264 프리셋
+
+    Returns:
+        dict: ffmpeg-python output() 키워드 인자
+    """
+    options = {'vcodec': encoder, 'pix_fmt': 'yuv420p'}
+
+    if encoder == 'h264_videotoolbox':
+        # VideoToolbox는 CRF가 없으므로 비트레이트로 제어
+        options['video_bitrate'] = str(int(video_bitrate)) if video_bitrate else '5M'
+        options['allow_sw'] = 1
+    elif encoder == 'h264_nvenc':
+        options.update({'preset': 'p4', 'rc': 'vbr', 'cq': crf})
+        if video_bitrate:
+            options['maxrate'] = str(int(video_bitrate))
+            options['bufsize'] = str(int(video_bitrate * 2))
+    elif encoder == 'h264_qsv':
+        options.update({'preset': 'medium', 'global_quality': crf})
+        if video_bitrate:
+            options['maxrate'] = str(int(video_bitrate))
+    else:
+        # libx264: 비트레이트 상한이 있는 CRF (capped CRF)로 1패스에 용량 제어
+        options.update({'crf': crf, 'preset': preset})
+        if video_bitrate:
+            options['maxrate'] = str(int(video_bitrate))
+            options['bufsize'] = str(int(video_bitrate * 2))
+
+    return options
+
+def get_mp4_audio_options(input_path, audio_bitrate='128k'):
+    """
+    MP4 출력용 오디오 옵션 생성 (호환되는 코덱이면 재인코딩 없이 복사)
+
+    Args:
+        input_path: 입력 파일 경로
+        audio_bitrate: 재인코딩이 필요할 때의 AAC 비트레이트
+
+    Returns:
+        dict: ffmpeg-python output() 키워드 인자
+    """
+    try:
+        probe = ffmpeg.probe(str(input_path))
+        audio_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'audio'), None)
+    except ffmpeg.Error:
+        audio_stream = None
+
+    if audio_stream and audio_stream.get('codec_name') in MP4_COPY_AUDIO_CODECS:
+        return {'acodec': 'copy'}
+    return {'acodec': 'aac', 'audio_bitrate': audio_bitrate}
+
+def get_video_duration(input_path):
+    """
+    컨테이너에 기록된 전체 길이 조회 (ffprobe 한 번)
+
+    Returns:
+        float: 길이 (초)
+    """
+    return float(ffmpeg.probe(str(input_path))['format']['duration'])
+
+def get_keyframe_times(input_path):
+    """
+    첫 번째 비디오 스트림의 키프레임 시각 목록 조회 (패킷 정보만 읽고 디코딩하지 않음)
+
+    Returns:
+        list: 키프레임 표시 시각 (초, 오름차순)
+    """
+    probe = ffmpeg.probe(str(input_path), select_streams='v:0', show_entries='packet=pts_time,flags')
+    return sorted(
+        float(packet['pts_time'])
+        for packet in probe.get('packets', [])
+        if 'K' in packet.get('flags', '') and packet.get('pts_time') not in (None, 'N/A')
+    )
+
+def iter_raw_video_frames(stream, width, height):
+    """
+    ffmpeg 스트림을 raw BGR 프레임으로 파이프 출력해 하나씩 반환하는 제너레이터
+
+    stderr는 별도 스레드에서 계속 읽으므로 오류 메시지가 많아도 파이프가 막히지 않습니다.
+    도중에 제너레이터를 닫으면 남은 디코딩은 기다리지 않고 ffmpeg를 종료합니다.
+
+    Args:
+        stream: ffmpeg-python 입력/필터 스트림 (예: ffmpeg.input(path).filter('fps', ...))
+        width, height: 출력 프레임 크기
+
+    Yields:
+        numpy.ndarray: (height, width, 3) uint8 BGR 프레임 (읽기 전용)
+
+    Raises:
+        ffmpeg.Error: ffmpeg가 실패하면 (stderr 포함, 디코딩이 중간에 실패해도 발생)
+    """
+    process = (
+        stream
+        .output('pipe:', format='rawvideo', pix_fmt='bgr24')
+        .global_args('-loglevel', 'error')
+        .run_async(pipe_stdout=True, pipe_stderr=True)
+    )
+    stderr_chunks = []
+    stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    stderr_reader.start()
+
+    frame_size = width * height * 3
+    finished = False
+    try:
+        while True:
+            raw_frame = process.stdout.read(frame_size)
+            if len(raw_frame) < frame_size:
+                break
+            yield np.frombuffer(raw_frame, dtype=np.uint8).reshape(height, width, 3)
+        finished = True
+    finally:
+        if not finished and process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+        stderr_reader.join()
+        process.stderr.close()
+
+    if process.returncode != 0:
+        raise ffmpeg.Error('ffmpeg', None, b''.join(stderr_chunks))
+
+def decode_audio(input_path, start_time=None, duration=None, sample_rate=16000):
+    """
+    오디오를 모노 float32 PCM으로 디코딩해 파이프로 바로 읽음 (임시 파일 없음)
+
+    -ss/-t를 입력 옵션(-i 앞)으로 지정하므로 ffmpeg가 시작 지점까지 디코딩하지 않고
+    바로 탐색합니다 (긴 영상 뒷부분 구간도 즉시 추출).
+
+    Args:
+        input_path: 입력 파일 경로
+        start_time: 시작 시간 (초, None이면 처음부터)
+        duration: 길이 (초, None이면 끝까지)
+        sample_rate: 출력 샘플레이트 (Whisper는 16000)
+
+    Returns:
+        numpy.ndarray: float32 오디오 샘플 (-1.0 ~ 1.0)
+    """
+    input_options = {}
+    if start_time is not None:
+        input_options['ss'] = start_time
+    if duration is not None:
+        input_options['t'] = duration
+
+    out, _ = (
+        ffmpeg
+        .input(str(input_path), **input_options)
+        .output('pipe:', format='f32le', acodec='pcm_f32le', ac=1, ar=sample_rate)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return np.frombuffer(out, dtype=np.float32)
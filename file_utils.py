@@ -5,17 +5,25 @@
 """
 
 import os
+import heapq
+import functools
 from pathlib import Path
 import datetime
 
+@functools.lru_cache(maxsize=1)
 def get_file_config():
-    """환경변수에서 파일 관련 설정들을 읽어옴"""
+    """
+    환경변수에서 파일 관련 설정들을 읽어옴
+    (최초 호출 시 한 번만 읽고 캐시하므로 반환된 딕셔너리는 수정하지 마세요)
+    """
+    supported_formats = os.getenv('SUPPORTED_INPUT_FORMATS', 'mp4,mov,avi,mkv,wmv,flv,webm,m4v')
     return {
         'input_video_path': os.getenv('INPUT_VIDEO_PATH', './input_video.mp4'),
         'output_dir': os.getenv('OUTPUT_DIR', './output'),
         'temp_dir': os.getenv('TEMP_DIR', './temp'),
+        'cache_dir': os.getenv('CACHE_DIR', './cache'),
         'default_output_format': os.getenv('DEFAULT_OUTPUT_FORMAT', 'mp4'),
-        'supported_input_formats': os.getenv('SUPPORTED_INPUT_FORMATS', 'mp4,mov,avi,mkv,wmv,flv,webm,m4v').split(','),
+        'supported_input_formats': frozenset(fmt.strip().lower() for fmt in supported_formats.split(',')),
         'output_filename_pattern': os.getenv('OUTPUT_FILENAME_PATTERN', '{stem}_{task}.{ext}')
     }
 
@@ -118,7 +126,7 @@ def validate_input_format(input_path):
     input_file = Path(input_path)
     file_extension = input_file.suffix.lower().lstrip('.')
     
-    return file_extension in [fmt.strip().lower() for fmt in config['supported_input_formats']]
+    return file_extension in config['supported_input_formats']
 
 def get_default_input_path():
     """환경변수에서 기본 입력 비디오 경로 가져오기"""
@@ -170,16 +178,22 @@ def clean_temp_files(keep_recent=5):
     if not temp_dir.exists():
         return
     
-    # 임시 파일들을 수정시간 순으로 정렬
-    temp_files = sorted(
-        [f for f in temp_dir.glob("temp_*") if f.is_file()],
-        key=lambda x: x.stat().st_mtime,
-        reverse=True
-    )
+    # 임시 파일 목록 수집 (scandir 항목의 stat을 그대로 사용해 파일당 stat 1회)
+    with os.scandir(temp_dir) as entries:
+        temp_files = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in entries
+            if entry.name.startswith("temp_") and entry.is_file()
+        ]
+    
+    # 전체 정렬 대신 최근 N개만 선택 (O(N log K))
+    recent_files = set(path for _, path in heapq.nlargest(keep_recent, temp_files))
     
     # 최근 파일들 제외하고 삭제
-    files_to_delete = temp_files[keep_recent:]
-    for file_path in files_to_delete:
+    for _, path in temp_files:
+        if path in recent_files:
+            continue
+        file_path = Path(path)
         try:
             file_path.unlink()
             print(f"🗑️  임시 파일 삭제: {file_path.name}")
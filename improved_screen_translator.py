@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
+import torch_env
+import asyncio
 import cv2
-import easyocr
 import openai
+import torch
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import os
@@ -10,23 +12,132 @@ import json
 import time
 import ffmpeg
 import sys
-from file_utils import get_output_path, get_default_input_path, validate_input_format
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from file_utils import get_output_path, get_default_input_path, validate_input_format, get_file_config, ensure_directory_exists
+from ocr_server import create_ocr_reader
+from ffmpeg_utils import iter_raw_video_frames, select_h264_encoder, get_h264_encoder_options, get_mp4_audio_options
+
+# EasyOCR 인식 옵션 (더 낮은 임계값으로 더 많은 텍스트 감지)
+OCR_READTEXT_OPTIONS = {
+    'detail': 1,
+    'paragraph': False,
+    'width_ths': 0.5,       # 더 넓은 폭 허용
+    'height_ths': 0.5,      # 더 넓은 높이 허용
+    'text_threshold': 0.5,  # 낮은 텍스트 임계값
+    'low_text': 0.3,        # 매우 낮은 임계값
+}
+
+# OCR용 torch float32 행렬곱 정밀도 (highest/high/medium, 비워두면 torch 기본값 유지)
+# 프로세스 전체 설정이라 같은 프로세스의 다른 모델(Whisper 등)에도 적용되므로 설정할 때만 사용
+OCR_MATMUL_PRECISION = os.getenv('OCR_MATMUL_PRECISION')
+
+# 언어별 문자 범위 정의
+LANGUAGE_RANGES = {
+    'ja': [  # 일본어
+        (0x3040, 0x309F),  # 히라가나
+        (0x30A0, 0x30FF),  # 가타카나
+        (0x4E00, 0x9FAF),  # 한자
+        (0xFF65, 0xFF9F),  # 반각 가타카나
+    ],
+    'ko': [  # 한국어
+        (0xAC00, 0xD7AF),  # 한글 음절
+        (0x1100, 0x11FF),  # 한글 자모
+        (0x3130, 0x318F),  # 한글 호환 자모
+        (0x4E00, 0x9FAF),  # 한자
+    ],
+    'zh': [  # 중국어
+        (0x4E00, 0x9FAF),  # 한자
+        (0x3400, 0x4DBF),  # 확장 한자 A
+        (0xF900, 0xFAFF),  # 호환 한자
+    ],
+    'en': [  # 영어 (라틴 문자)
+        (0x0041, 0x005A),  # 대문자
+        (0x0061, 0x007A),  # 소문자
+    ]
+}
+
+# 언어별 문자 범위를 시작값 기준으로 정렬한 배열 (np.searchsorted 조회용)
+LANGUAGE_RANGE_ARRAYS = {
+    language: (
+        np.array([start for start, _ in sorted(ranges)], dtype=np.uint32),
+        np.array([end for _, end in sorted(ranges)], dtype=np.uint32),
+    )
+    for language, ranges in LANGUAGE_RANGES.items()
+}
+
+def _opencv_cuda_device_count():
+    """CUDA 지원 OpenCV 빌드와 GPU가 있는지 확인 (일반 pip 빌드는 0)"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount()
+    except (AttributeError, cv2.error):
+        return 0
+
+OPENCV_CUDA_AVAILABLE = _opencv_cuda_device_count() > 0
+
+# OCR 전처리 노이즈 제거 방식
+# - gaussian: 분리형 가우시안 (슬라이드/UI 텍스트에 충분하고 bilateral 대비 약 10배 빠름)
+# - bilateral: 기존 방식 (9x9 커널, 가장 느림)
+# - nlmeans: 실제 촬영 노이즈가 많은 영상용
+# - none: 노이즈 제거 생략
+DENOISE_FILTERS = ('gaussian', 'bilateral', 'nlmeans', 'none')
+
+# 번역 캐시에 보관할 최대 텍스트 수 (LRU)
+TRANSLATION_CACHE_SIZE = 2048
+
+def normalize_translation_key(text):
+    """번역 캐시 키 정규화 (유니코드 호환 문자 통일 + 공백 정리)"""
+    return " ".join(unicodedata.normalize('NFKC', text).split())
+
+# 긴 변이 이 크기 미만인 저해상도 프레임만 OCR 전 2배 업스케일
+# (720p 이상 슬라이드 영상은 텍스트가 이미 충분히 커서 업스케일 시 검출 비용만 4배가 됨)
+OCR_UPSCALE_MAX_DIMENSION = 900
+
+def ocr_upscale_factor(frame):
+    """OCR 전처리에서 적용할 업스케일 배율 (1 또는 2)"""
+    height, width = frame.shape[:2]
+    return 2 if max(height, width) < OCR_UPSCALE_MAX_DIMENSION else 1
+
+# 이 비트 수 미만으로 dHash가 다르면 같은 화면으로 간주
+FRAME_HASH_MAX_DISTANCE = 5
+
+def dhash_frame(frame):
+    """프레임의 64비트 차분 해시(dHash) 계산 (9x8 그레이 축소 후 인접 픽셀 비교)"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1])
+
+def hash_distance(hash_a, hash_b):
+    """두 dHash 사이의 해밍 거리 (다른 비트 수)"""
+    return int(np.unpackbits(hash_a ^ hash_b).sum())
 
 class ImprovedScreenTextTranslator:
-    def __init__(self, openai_api_key=None, source_language=None, target_language=None, ocr_languages=None):
+    def __init__(self, openai_api_key=None, source_language=None, target_language=None, ocr_languages=None, denoise_filter=None):
         print("🔧 개선된 OCR 및 번역 시스템 초기화 중...")
         
         # 언어 설정 (환경변수에서 기본값 읽기)
         self.source_language = source_language or os.getenv('SOURCE_LANGUAGE', 'ja')
         self.target_language = target_language or os.getenv('TARGET_LANGUAGE', 'Korean')
         
+        # OCR 전처리 노이즈 제거 방식 (gaussian, bilateral, nlmeans, none)
+        self.denoise_filter = (denoise_filter or os.getenv('OCR_DENOISE_FILTER', 'gaussian')).lower()
+        if self.denoise_filter not in DENOISE_FILTERS:
+            print(f"⚠️  알 수 없는 노이즈 제거 방식: {self.denoise_filter} → gaussian 사용")
+            self.denoise_filter = 'gaussian'
+        
         # OCR 언어 설정
         ocr_lang_str = ocr_languages or os.getenv('OCR_LANGUAGES', 'ja,en')
         ocr_lang_list = [lang.strip() for lang in ocr_lang_str.split(',')]
         
-        # OCR 초기화
-        self.ocr_reader = easyocr.Reader(ocr_lang_list, gpu=False)
-        print(f"✅ EasyOCR 초기화 완료: {ocr_lang_list}")
+        # OCR 초기화 (CUDA > Apple Silicon MPS > CPU, 화면 텍스트 번역기와 같은 방식)
+        if OCR_MATMUL_PRECISION:
+            torch.set_float32_matmul_precision(OCR_MATMUL_PRECISION)
+        self.ocr_reader, ocr_device = create_ocr_reader(ocr_lang_list)
+        print(f"✅ EasyOCR 초기화 완료: {ocr_lang_list} ({ocr_device})")
         
         # OpenAI 설정
         if openai_api_key:
@@ -35,8 +146,35 @@ class ImprovedScreenTextTranslator:
         else:
             print("⚠️  OpenAI API 키가 없어 번역 기능이 제한됩니다.")
         
+        # 오버레이용 작은 한글 폰트 (프레임마다 디스크에서 다시 읽지 않도록 한 번만 로드)
+        self._font = self._load_font()
+        
+        # 반복되는 헤더/푸터 등을 다시 번역하지 않도록 텍스트별 번역 결과 보관
+        self._translation_cache = OrderedDict()
+        
+        # 전처리 필터 객체(CLAHE 등)를 스레드별로 한 번만 생성해 재사용
+        self._filter_local = threading.local()
+        
         print(f"🌐 언어 설정: {self.source_language} → {self.target_language}")
     
+    def _load_font(self, size=12):
+        """오버레이용 한글 폰트 로드 (없으면 기본 폰트)"""
+        try:
+            font_paths = [
+                "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+                "/System/Library/Fonts/Helvetica.ttc",
+                "/Library/Fonts/Arial Unicode MS.ttf"
+            ]
+            
+            for font_path in font_paths:
+                if os.path.exists(font_path):
+                    return ImageFont.truetype(font_path, size)
+                
+        except:
+            pass
+        
+        return ImageFont.load_default()
+    
     def extract_frames_from_segment(self, video_path, start_time=None, end_time=None, interval_seconds=10):
         """비디오 구간에서 프레임 추출"""
         if start_time is not None and end_time is not None:
@@ -44,251 +182,410 @@ class ImprovedScreenTextTranslator:
         else:
             print(f"🎬 전체 비디오에서 프레임 추출 중: {interval_seconds}초 간격")
         
-        cap = cv2.VideoCapture(video_path)
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = total_frames / fps
+        # 비디오 정보 확인
+        probe = ffmpeg.probe(video_path)
+        video_stream = next(stream for stream in probe['streams'] if stream['codec_type'] == 'video')
+        width = int(video_stream['width'])
+        height = int(video_stream['height'])
+        fps = float(Fraction(video_stream['r_frame_rate']))
         
-        # 구간 설정
+        # 구간 설정 (-ss를 입력 옵션으로 두어 키프레임 단위 빠른 탐색)
+        input_options = {}
         if start_time is not None and end_time is not None:
-            start_frame = int(start_time * fps)
-            end_frame = int(end_time * fps)
+            input_options = {'ss': start_time, 't': end_time - start_time}
         else:
-            start_frame = 0
-            end_frame = total_frames
             start_time = 0
-            end_time = duration
         
-        frames_data = []
-        frame_interval = fps * interval_seconds
+        # fps 필터로 필요한 프레임만 골라 raw BGR로 파이프 출력 (프레임별 seek 없이 한 번만 순차 디코딩)
+        # (round='up'이면 k번째 프레임이 정확히 k*interval초 시점, 기본값 near는 간격의 절반만큼 늦은 프레임)
+        stream = ffmpeg.input(video_path, **input_options).filter('fps', fps=f"1/{interval_seconds}", round='up')
         
-        for frame_num in range(start_frame, end_frame, frame_interval):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = cap.read()
-            
-            if not ret:
-                break
+        frames_data = []
+        try:
+            for frame in iter_raw_video_frames(stream, width, height):
+                timestamp = start_time + len(frames_data) * interval_seconds
+                frames_data.append({
+                    'frame_number': int(round(timestamp * fps)),
+                    'timestamp': timestamp,
+                    'frame': frame
+                })
                 
-            timestamp = frame_num / fps
-            frames_data.append({
-                'frame_number': frame_num,
-                'timestamp': timestamp,
-                'frame': frame
-            })
-            
-            print(f"📸 프레임 추출: {timestamp:.1f}초")
+                print(f"📸 프레임 추출: {timestamp:.1f}초")
+        except ffmpeg.Error as e:
+            print(f"❌ 프레임 추출 실패: {e.stderr.decode('utf-8', errors='ignore') if e.stderr else e}")
+            raise
         
-        cap.release()
         print(f"✅ 총 {len(frames_data)}개 프레임 추출 완료")
         return frames_data
     
+    def _get_clahe(self):
+        """현재 스레드용 CLAHE 객체 (OpenCV 알고리즘 객체는 내부 버퍼를 가지므로 스레드 간 공유하지 않음)"""
+        clahe = getattr(self._filter_local, 'clahe', None)
+        if clahe is None:
+            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+            self._filter_local.clahe = clahe
+        return clahe
+    
+    def _get_cuda_filters(self):
+        """현재 스레드용 CUDA CLAHE/가우시안 필터 객체"""
+        filters = getattr(self._filter_local, 'cuda_filters', None)
+        if filters is None:
+            filters = {
+                'clahe': cv2.cuda.createCLAHE(clipLimit=2.0, tileGridSize=(8,8)),
+                'gaussian': cv2.cuda.createGaussianFilter(cv2.CV_8UC1, cv2.CV_8UC1, (7, 7), 1.0),
+            }
+            self._filter_local.cuda_filters = filters
+        return filters
+    
     def enhance_frame_for_ocr(self, frame):
         """OCR 정확도를 위한 프레임 전처리"""
+        if OPENCV_CUDA_AVAILABLE:
+            return self.enhance_frame_for_ocr_cuda(frame)
+        
         # 그레이스케일 변환
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
-        # 해상도 업스케일링 (2배)
-        height, width = gray.shape
-        enhanced = cv2.resize(gray, (width*2, height*2), interpolation=cv2.INTER_CUBIC)
+        # 저해상도 프레임만 업스케일링 (2배)
+        scale = ocr_upscale_factor(gray)
+        if scale > 1:
+            height, width = gray.shape
+            enhanced = cv2.resize(gray, (width*scale, height*scale), interpolation=cv2.INTER_CUBIC)
+        else:
+            enhanced = gray
         
         # 노이즈 제거
-        enhanced = cv2.bilateralFilter(enhanced, 9, 75, 75)
+        enhanced = self.denoise_for_ocr(enhanced)
         
         # 대비 개선
-        enhanced = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8)).apply(enhanced)
+        enhanced = self._get_clahe().apply(enhanced)
         
         return enhanced
     
-    def extract_text_improved(self, frame):
-        """개선된 텍스트 추출"""
-        try:
-            # 프레임 전처리
-            enhanced_frame = self.enhance_frame_for_ocr(frame)
-            
-            # OCR 실행 (더 낮은 임계값으로 더 많은 텍스트 감지)
-            results = self.ocr_reader.readtext(
-                enhanced_frame, 
-                detail=1,
-                paragraph=False,
-                width_ths=0.5,    # 더 넓은 폭 허용
-                height_ths=0.5,   # 더 넓은 높이 허용
-                text_threshold=0.5,  # 낮은 텍스트 임계값
-                low_text=0.3      # 매우 낮은 임계값
-            )
-            
-            source_texts = []
-            for (bbox, text, confidence) in results:
-                # 더 낮은 신뢰도도 허용 (50% 이상)
-                if confidence > 0.5:
-                    # 소스 언어 문자가 포함된 텍스트만 필터링
-                    if self.contains_source_language(text):
-                        # 스케일링 보정 (2배 업스케일했으므로 좌표를 반으로)
-                        corrected_bbox = [[point[0]/2, point[1]/2] for point in bbox]
-                        
-                        source_texts.append({
-                            'text': text.strip(),
-                            'bbox': corrected_bbox,
-                            'confidence': confidence
-                        })
-            
-            return source_texts
-            
-        except Exception as e:
-            print(f"❌ OCR 오류: {e}")
-            return []
+    def denoise_for_ocr(self, gray):
+        """설정된 방식으로 그레이스케일 프레임 노이즈 제거"""
+        if self.denoise_filter == 'gaussian':
+            return cv2.GaussianBlur(gray, (0, 0), sigmaX=1.0)
+        if self.denoise_filter == 'bilateral':
+            return cv2.bilateralFilter(gray, 9, 75, 75)
+        if self.denoise_filter == 'nlmeans':
+            return cv2.fastNlMeansDenoising(gray, h=10)
+        return gray
+    
+    def denoise_for_ocr_cuda(self, gpu_gray):
+        """denoise_for_ocr의 GPU 버전 (GpuMat 입력/출력)"""
+        if self.denoise_filter == 'gaussian':
+            return self._get_cuda_filters()['gaussian'].apply(gpu_gray)
+        if self.denoise_filter == 'bilateral':
+            return cv2.cuda.bilateralFilter(gpu_gray, 9, 75, 75)
+        if self.denoise_filter == 'nlmeans':
+            return cv2.cuda.fastNlMeansDenoising(gpu_gray, 10)
+        return gpu_gray
+    
+    def enhance_frame_for_ocr_cuda(self, frame):
+        """enhance_frame_for_ocr와 같은 전처리를 OpenCV CUDA 모듈로 GPU에서 수행"""
+        height, width = frame.shape[:2]
+        scale = ocr_upscale_factor(frame)
+        
+        # 프레임을 한 번만 업로드하고 모든 단계를 GPU 메모리에서 연결
+        gpu_frame = cv2.cuda_GpuMat()
+        gpu_frame.upload(frame)
+        
+        enhanced = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGR2GRAY)
+        if scale > 1:
+            enhanced = cv2.cuda.resize(enhanced, (width*scale, height*scale), interpolation=cv2.INTER_CUBIC)
+        enhanced = self.denoise_for_ocr_cuda(enhanced)
+        enhanced = self._get_cuda_filters()['clahe'].apply(enhanced, cv2.cuda.Stream_Null())
+        
+        return enhanced.download()
+    
+    def extract_texts_batched(self, frames, batch_size=8):
+        """
+        여러 프레임의 텍스트를 배치 OCR로 추출
+        
+        전처리는 스레드 풀에서 병렬로 수행하고(OpenCV는 GIL을 해제),
+        EasyOCR은 batch_size 단위로 한 번에 호출하여 프레임별 호출 오버헤드를 줄입니다.
+        
+        Returns:
+            list: 프레임별 소스 언어 텍스트 목록 (입력 순서 유지)
+        """
+        frame_texts = []
+        
+        with ThreadPoolExecutor() as executor:
+            for chunk_start in range(0, len(frames), batch_size):
+                chunk = frames[chunk_start:chunk_start + batch_size]
+                enhanced_frames = list(executor.map(self.enhance_frame_for_ocr, chunk))
+                
+                try:
+                    batch_results = self.ocr_reader.readtext_batched(
+                        enhanced_frames,
+                        batch_size=batch_size,
+                        **OCR_READTEXT_OPTIONS
+                    )
+                except Exception as e:
+                    print(f"❌ OCR 오류: {e}")
+                    batch_results = [[] for _ in chunk]
+                
+                frame_texts.extend(
+                    self.filter_source_texts(results, ocr_upscale_factor(frame))
+                    for frame, results in zip(chunk, batch_results)
+                )
+                print(f"🔍 OCR 진행: {len(frame_texts)}/{len(frames)} 프레임")
+        
+        return frame_texts
+    
+    def filter_source_texts(self, results, scale=1):
+        """
+        OCR 결과에서 신뢰도와 언어 조건을 만족하는 텍스트만 선별
+        
+        Args:
+            results: EasyOCR readtext 결과
+            scale: 전처리 업스케일 배율 (bbox를 원본 프레임 좌표로 되돌릴 때 사용)
+        """
+        # 더 낮은 신뢰도도 허용 (50% 이상)
+        candidates = [(bbox, text, confidence) for (bbox, text, confidence) in results if confidence > 0.5]
+        
+        # 소스 언어 문자가 포함된 텍스트만 필터링 (후보 전체를 한 번에 판정)
+        is_source = self.contains_source_language_batch([text for _, text, _ in candidates])
+        
+        source_texts = []
+        for (bbox, text, confidence), matched in zip(candidates, is_source):
+            if matched:
+                # 스케일링 보정 (업스케일한 배율만큼 좌표를 원본 크기로)
+                corrected_bbox = [[point[0]/scale, point[1]/scale] for point in bbox]
+                
+                source_texts.append({
+                    'text': text.strip(),
+                    'bbox': corrected_bbox,
+                    'confidence': confidence
+                })
+        
+        return source_texts
     
     def contains_source_language(self, text):
         """텍스트에 소스 언어 문자가 포함되어 있는지 확인"""
-        # 언어별 문자 범위 정의
-        language_ranges = {
-            'ja': [  # 일본어
-                (0x3040, 0x309F),  # 히라가나
-                (0x30A0, 0x30FF),  # 가타카나  
-                (0x4E00, 0x9FAF),  # 한자
-                (0xFF65, 0xFF9F),  # 반각 가타카나
-            ],
-            'ko': [  # 한국어
-                (0xAC00, 0xD7AF),  # 한글 음절
-                (0x1100, 0x11FF),  # 한글 자모
-                (0x3130, 0x318F),  # 한글 호환 자모
-                (0x4E00, 0x9FAF),  # 한자
-            ],
-            'zh': [  # 중국어
-                (0x4E00, 0x9FAF),  # 한자
-                (0x3400, 0x4DBF),  # 확장 한자 A
-                (0xF900, 0xFAFF),  # 호환 한자
-            ],
-            'en': [  # 영어 (라틴 문자)
-                (0x0041, 0x005A),  # 대문자
-                (0x0061, 0x007A),  # 소문자
-            ]
-        }
+        return self.contains_source_language_batch([text])[0]
+    
+    def contains_source_language_batch(self, texts):
+        """
+        여러 텍스트의 소스 언어 여부를 한 번에 판정
         
-        # 소스 언어의 문자 범위 가져오기
-        target_ranges = language_ranges.get(self.source_language, language_ranges['ja'])
+        모든 텍스트를 이어 붙여 코드포인트 배열로 만든 뒤 NumPy 벡터 연산으로
+        문자 범위를 검사하므로 문자별 파이썬 루프가 없습니다.
         
-        target_count = 0
-        total_chars = len(text.strip())
+        Returns:
+            list: 텍스트별 판정 결과 (문자의 30% 이상이 해당 언어면 True)
+        """
+        if not texts:
+            return []
         
-        if total_chars == 0:
-            return False
-            
-        for char in text:
-            char_code = ord(char)
-            for start, end in target_ranges:
-                if start <= char_code <= end:
-                    target_count += 1
-                    break
+        # 소스 언어의 문자 범위 가져오기
+        range_starts, range_ends = LANGUAGE_RANGE_ARRAYS.get(self.source_language, LANGUAGE_RANGE_ARRAYS['ja'])
+        
+        # 각 문자가 속할 수 있는 범위를 이진 탐색으로 한 번에 찾은 뒤 끝값과 비교
+        codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+        range_index = np.searchsorted(range_starts, codes, side='right') - 1
+        mask = (range_index >= 0) & (codes <= range_ends[range_index.clip(0)])
+        
+        # 텍스트별 일치 문자 수 (누적합 차이로 계산)
+        cumulative = np.concatenate(([0], np.cumsum(mask)))
+        lengths = np.array([len(text) for text in texts])
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        target_counts = cumulative[ends] - cumulative[starts]
+        
+        results = []
+        for text, target_count in zip(texts, target_counts):
+            total_chars = len(text.strip())
+            # 문자의 30% 이상이 해당 언어면 해당 언어 텍스트로 간주
+            results.append(bool(total_chars > 0 and target_count / total_chars >= 0.3))
+        return results
+    
+    def build_batch_messages(self, texts):
+        """배치 번역 요청 메시지 생성 (텍스트는 '---'로 구분)"""
+        batch_text = "\n---\n".join(texts)
+        
+        return [
+            {
+                "role": "system",
+                "content": f"""당신은 전문 번역가입니다.
+                화면에 표시된 슬라이드/UI 텍스트를 번역합니다.
+                {self.source_language.upper()}를 매우 간결하고 핵심적인 {self.target_language}로 번역하세요.
+                기술 용어, 회사명, 고유명사는 적절히 유지하되 읽기 쉽게 하세요.
+                긴 문장은 핵심만 간단히 번역하세요.
+                각 텍스트는 '---'로 구분되어 있습니다."""
+            },
+            {
+                "role": "user",
+                "content": f"다음 {self.source_language.upper()} 텍스트들을 간결한 {self.target_language}로 번역해주세요:\n\n{batch_text}"
+            }
+        ]
+    
+    def build_single_messages(self, text):
+        """단일 텍스트 번역 요청 메시지 생성"""
+        return [
+            {"role": "system", "content": f"{self.source_language.upper()}를 간결한 {self.target_language}로 번역하세요."},
+            {"role": "user", "content": text}
+        ]
+    
+    def get_cached_translation(self, text):
+        """캐시된 번역 조회 (없으면 None)"""
+        key = normalize_translation_key(text)
+        translation = self._translation_cache.get(key)
+        if translation is not None:
+            self._translation_cache.move_to_end(key)
+        return translation
+    
+    def cache_translation(self, text, translation):
+        """번역 결과를 캐시에 저장 (실패 결과는 저장하지 않음)"""
+        if translation.startswith("[번역 실패]"):
+            return
+        key = normalize_translation_key(text)
+        self._translation_cache[key] = translation
+        self._translation_cache.move_to_end(key)
+        if len(self._translation_cache) > TRANSLATION_CACHE_SIZE:
+            self._translation_cache.popitem(last=False)
+    
+    def translate_batches_concurrently(self, text_batches, max_concurrency=10):
+        """
+        여러 프레임의 텍스트 묶음을 동시에 번역
+        
+        프레임별 요청을 AsyncOpenAI로 한꺼번에 보내므로 전체 지연이
+        (프레임 수 × 왕복 시간)에서 가장 느린 요청 하나 수준으로 줄어듭니다.
+        캐시에 있거나 앞선 프레임에서 이미 요청한 텍스트는 다시 보내지 않습니다.
+        
+        Args:
+            text_batches: 프레임별 번역할 텍스트 목록의 목록
+            max_concurrency: 동시에 진행할 최대 요청 수
+        
+        Returns:
+            list: 입력과 같은 순서의 프레임별 번역 목록
+        """
+        if not text_batches:
+            return []
         
-        # 문자의 30% 이상이 해당 언어면 해당 언어 텍스트로 간주
-        return target_count / total_chars >= 0.3
+        if not openai.api_key:
+            return [[f"[번역 필요] {text}" for text in texts] for texts in text_batches]
+        
+        # 프레임별로 아직 번역되지 않은 텍스트만 요청 목록에 추가 (프레임 간 중복 제거)
+        requested_keys = set()
+        request_batches = []
+        for texts in text_batches:
+            pending = []
+            for text in texts:
+                key = normalize_translation_key(text)
+                if key not in requested_keys and self.get_cached_translation(text) is None:
+                    requested_keys.add(key)
+                    pending.append(text)
+            if pending:
+                request_batches.append(pending)
+        
+        total_texts = sum(len(texts) for texts in text_batches)
+        print(f"🌐 {len(request_batches)}개 요청으로 텍스트 {len(requested_keys)}개 동시 번역 중... (전체 {total_texts}개 중 나머지는 캐시/중복)")
+        
+        # 이번 실행의 결과 (캐시에 저장하지 않는 실패 결과 포함)
+        fresh_translations = {}
+        if request_batches:
+            results = asyncio.run(self._translate_batches_async(request_batches, max_concurrency))
+            for texts, translations in zip(request_batches, results):
+                for text, translation in zip(texts, translations):
+                    fresh_translations[normalize_translation_key(text)] = translation
+                    self.cache_translation(text, translation)
+        
+        print(f"✅ 동시 번역 완료: {len(text_batches)}개 프레임")
+        return [
+            [fresh_translations.get(normalize_translation_key(text)) or self.get_cached_translation(text) or f"[번역 실패] {text}"
+             for text in texts]
+            for texts in text_batches
+        ]
     
-    def translate_texts_improved(self, texts):
-        """개선된 텍스트 번역 (더 간결하게)"""
-        if not openai.api_key or not texts:
-            return [f"[번역 필요] {text}" for text in texts]
+    async def _translate_batches_async(self, text_batches, max_concurrency):
+        client = openai.AsyncOpenAI(api_key=openai.api_key)
+        semaphore = asyncio.Semaphore(max_concurrency)
         
-        print(f"🌐 {len(texts)}개 텍스트 번역 중...")
+        async def translate_batch(texts):
+            async with semaphore:
+                return await self._translate_texts_async(client, texts)
         
         try:
-            # 배치 번역
-            batch_text = "\n---\n".join(texts)
-            
-            response = openai.chat.completions.create(
+            return await asyncio.gather(*(translate_batch(texts) for texts in text_batches))
+        finally:
+            await client.close()
+    
+    async def _translate_texts_async(self, client, texts):
+        """텍스트 목록 하나를 배치로 번역 (개수 불일치 시 개별 번역도 동시에 요청)"""
+        try:
+            response = await client.chat.completions.create(
                 model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"""당신은 전문 번역가입니다.
-                        화면에 표시된 슬라이드/UI 텍스트를 번역합니다.
-                        {self.source_language.upper()}를 매우 간결하고 핵심적인 {self.target_language}로 번역하세요.
-                        기술 용어, 회사명, 고유명사는 적절히 유지하되 읽기 쉽게 하세요.
-                        긴 문장은 핵심만 간단히 번역하세요.
-                        각 텍스트는 '---'로 구분되어 있습니다."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"다음 {self.source_language.upper()} 텍스트들을 간결한 {self.target_language}로 번역해주세요:\n\n{batch_text}"
-                    }
-                ]
+                messages=self.build_batch_messages(texts)
             )
-            
-            translated_batch = response.choices[0].message.content
-            translations = translated_batch.split("\n---\n")
-            
-            # 개수 맞추기
-            if len(translations) != len(texts):
-                print("⚠️  번역 개수 불일치, 개별 번역으로 재시도...")
-                return [self.translate_single_text(text) for text in texts]
-            
-            print(f"✅ 번역 완료: {len(translations)}개")
-            return translations
-            
+            translations = response.choices[0].message.content.split("\n---\n")
         except Exception as e:
             print(f"❌ 번역 오류: {e}")
             return [f"[번역 실패] {text}" for text in texts]
+        
+        if len(translations) == len(texts):
+            return translations
+        
+        print("⚠️  번역 개수 불일치, 개별 번역으로 재시도...")
+        
+        async def translate_single(text):
+            # 배치 요청의 동시성 슬롯 안에서 프레임 내 개별 요청을 함께 보냄
+            try:
+                response = await client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=self.build_single_messages(text)
+                )
+                return response.choices[0].message.content
+            except Exception:
+                return f"[번역 실패] {text}"
+        
+        return await asyncio.gather(*(translate_single(text) for text in texts))
     
-    def translate_single_text(self, text):
-        """단일 텍스트 번역"""
-        try:
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": f"{self.source_language.upper()}를 간결한 {self.target_language}로 번역하세요."},
-                    {"role": "user", "content": text}
-                ]
-            )
-            return response.choices[0].message.content
-        except:
-            return f"[번역 실패] {text}"
+    def create_overlay_tile(self, frame_size, text_data_list):
+        """
+        오버레이 레이어에서 실제로 그려진 영역(배경 박스들의 합집합)만 잘라낸 타일 생성
+        
+        Returns:
+            tuple: (RGBA 타일 이미지, 프레임 내 (x, y) 위치) - 그릴 내용이 없으면 (None, None)
+        """
+        layer = self.create_overlay_layer(frame_size, text_data_list)
+        content_box = layer.getbbox()
+        if content_box is None:
+            return None, None
+        return layer.crop(content_box), content_box[:2]
     
-    def create_improved_overlay_frame(self, original_frame, text_data_list):
-        """개선된 오버레이 프레임 생성 (작은 폰트, 깔끔한 디자인)"""
-        height, width = original_frame.shape[:2]
+    def create_overlay_layer(self, frame_size, text_data_list):
+        """번역 텍스트와 반투명 배경만 그린 투명 RGBA 레이어 생성"""
+        # 초기화 시 한 번 로드한 작은 한글 폰트 사용
+        font = self._font
         
-        # PIL로 변환하여 한글 폰트 처리
-        pil_image = Image.fromarray(cv2.cvtColor(original_frame, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(pil_image)
+        overlay = Image.new('RGBA', frame_size, (0, 0, 0, 0))
+        if not text_data_list:
+            return overlay
         
-        # 작은 한글 폰트 로드
-        try:
-            font_paths = [
-                "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-                "/System/Library/Fonts/Helvetica.ttc",
-                "/Library/Fonts/Arial Unicode MS.ttf"
-            ]
-            
-            font = None
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    font = ImageFont.truetype(font_path, 12)  # 작은 폰트 크기
-                    break
-            
-            if font is None:
-                font = ImageFont.load_default()
-                
-        except:
-            font = ImageFont.load_default()
+        overlay_draw = ImageDraw.Draw(overlay)
+        text_items = []
+        
+        # 바운딩 박스 좌표 계산 (N×4×2 배열로 모아 최소/최대를 한 번에 계산)
+        bboxes = np.array([text_data['bbox'] for text_data in text_data_list], dtype=np.float32)
+        bbox_mins = bboxes.min(axis=1)
+        bbox_maxs = bboxes.max(axis=1)
         
-        for text_data in text_data_list:
-            bbox = text_data['bbox']
+        for i, text_data in enumerate(text_data_list):
             translated_text = text_data['translated_text']
             
             # 긴 텍스트는 줄임
             if len(translated_text) > 20:
                 translated_text = translated_text[:18] + "..."
             
-            # 바운딩 박스 좌표 계산
-            x_coords = [point[0] for point in bbox]
-            y_coords = [point[1] for point in bbox]
-            x_min, x_max = min(x_coords), max(x_coords)
-            y_min, y_max = min(y_coords), max(y_coords)
+            x_min = float(bbox_mins[i, 0])
+            y_max = float(bbox_maxs[i, 1])
             
             # 번역 텍스트를 원본 바로 아래쪽에 작게 배치
             text_y = y_max + 2
             
-            # 작은 배경 사각형 그리기
-            text_bbox = draw.textbbox((x_min, text_y), translated_text, font=font)
+            # 작은 반투명 배경 사각형 그리기
+            text_bbox = overlay_draw.textbbox((x_min, text_y), translated_text, font=font)
             padding = 2
             bg_bbox = [
                 text_bbox[0] - padding,
@@ -296,49 +593,100 @@ class ImprovedScreenTextTranslator:
                 text_bbox[2] + padding,
                 text_bbox[3] + padding
             ]
-            
-            # 반투명 배경
-            overlay = Image.new('RGBA', pil_image.size, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
             overlay_draw.rectangle(bg_bbox, fill=(0, 0, 0, 120))
-            
-            # 배경 합성
-            pil_image = Image.alpha_composite(pil_image.convert('RGBA'), overlay).convert('RGB')
-            draw = ImageDraw.Draw(pil_image)
-            
-            # 작은 번역 텍스트 그리기 (흰색)
-            draw.text((x_min, text_y), translated_text, font=font, fill=(255, 255, 255))
+            text_items.append(((x_min, text_y), translated_text))
+        
+        # 배경 위에 작은 번역 텍스트 그리기 (흰색)
+        for position, translated_text in text_items:
+            overlay_draw.text(position, translated_text, font=font, fill=(255, 255, 255, 255))
         
-        # PIL에서 OpenCV로 다시 변환
-        result_frame = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        return overlay
+    
+    def find_reference_frames(self, frames_data, max_distance=FRAME_HASH_MAX_DISTANCE):
+        """
+        각 프레임이 OCR 결과를 재사용할 기준 프레임 인덱스 계산
+        
+        마지막으로 OCR한 프레임과 dHash 해밍 거리가 max_distance 미만이면
+        같은 화면(같은 슬라이드)으로 보고 그 프레임의 인덱스를, 아니면 자기 자신을 반환합니다.
+        """
+        reference_indices = []
+        reference_hash = None
+        
+        for i, frame_data in enumerate(frames_data):
+            frame_hash = dhash_frame(frame_data['frame'])
+            if reference_hash is not None and hash_distance(frame_hash, reference_hash) < max_distance:
+                reference_indices.append(reference_indices[-1])
+            else:
+                reference_indices.append(i)
+                reference_hash = frame_hash
         
-        return result_frame
+        return reference_indices
     
     def process_video_segment_improved(self, video_path, output_path, start_time=None, end_time=None, interval_seconds=10):
         """개선된 비디오 구간 처리"""
         segment_info = f"_{start_time}s-{end_time}s" if start_time is not None and end_time is not None else ""
         print(f"🚀 개선된 화면 텍스트 번역 시작: {Path(video_path).name}{segment_info}")
         
+        # 1-4. 샘플 프레임 OCR, 번역, 오버레이 타일 준비
+        processed_frames = self.prepare_overlay_frames(video_path, start_time, end_time, interval_seconds)
+        
+        # 5. 처리된 프레임들로 비디오 생성
+        self.create_video_from_processed_frames_improved(video_path, processed_frames, output_path, start_time, end_time)
+        
+        return output_path
+    
+    def prepare_overlay_frames(self, video_path, start_time=None, end_time=None, interval_seconds=10):
+        """
+        샘플 프레임에서 텍스트를 추출/번역하고 오버레이 타일까지 준비 (영상 인코딩은 하지 않음)
+        
+        Returns:
+            list: create_video_from_processed_frames_improved에 전달할 처리된 프레임 목록
+        """
         # 1. 프레임 추출
         frames_data = self.extract_frames_from_segment(video_path, start_time, end_time, interval_seconds)
         
-        # 2. 각 프레임에서 텍스트 추출 및 번역
+        # 2. 화면이 바뀐 프레임만 골라 배치 OCR로 소스 언어 텍스트 추출
+        reference_indices = self.find_reference_frames(frames_data)
+        changed_indices = [i for i, ref in enumerate(reference_indices) if ref == i]
+        print(f"🖼️  화면 변화 프레임: {len(changed_indices)}/{len(frames_data)}개 (나머지는 이전 결과 재사용)")
+        
+        changed_texts = self.extract_texts_batched([frames_data[i]['frame'] for i in changed_indices])
+        frame_texts = dict(zip(changed_indices, changed_texts))
+        
+        # 3. 텍스트가 있는 모든 프레임의 번역을 동시에 요청
+        frames_with_text = [i for i in changed_indices if frame_texts[i]]
+        translations = self.translate_batches_concurrently(
+            [[item['text'] for item in frame_texts[i]] for i in frames_with_text]
+        )
+        frame_translations = dict(zip(frames_with_text, translations))
+        
+        # 원본 프레임은 더 이상 필요 없으므로 해제 (크기와 시간 정보만 유지)
+        frame_height, frame_width = frames_data[0]['frame'].shape[:2] if frames_data else (0, 0)
+        frame_size = (frame_width, frame_height)
+        timestamps = [frame_data['timestamp'] for frame_data in frames_data]
+        del frames_data
+        
+        # 4. 프레임별 오버레이 타일 생성 (전체 프레임 대신 번역 영역만 잘라 위치와 함께 보관)
         processed_frames = []
         
-        for i, frame_data in enumerate(frames_data):
-            print(f"\n📝 프레임 {i+1}/{len(frames_data)} 처리 중 ({frame_data['timestamp']:.1f}초)")
+        for i, timestamp in enumerate(timestamps):
+            print(f"\n📝 프레임 {i+1}/{len(timestamps)} 처리 중 ({timestamp:.1f}초)")
             
-            frame = frame_data['frame']
+            reference = reference_indices[i]
             
-            # 개선된 OCR로 소스 언어 텍스트 추출
-            source_texts = self.extract_text_improved(frame)
+            if reference != i:
+                # 이전 프레임과 같은 화면: OCR, 번역, 오버레이 타일 재사용
+                reused = processed_frames[reference]
+                print(f"   ♻️  {timestamps[reference]:.1f}초 프레임과 동일한 화면, 결과 재사용")
+                processed_frames.append({**reused, 'timestamp': timestamp})
+                continue
+            
+            source_texts = frame_texts[i]
             
             if source_texts:
                 print(f"   📖 추출된 {self.source_language.upper()} 텍스트: {len(source_texts)}개")
                 
-                # 텍스트만 추출하여 번역
-                texts_to_translate = [item['text'] for item in source_texts]
-                translated_texts = self.translate_texts_improved(texts_to_translate)
+                translated_texts = frame_translations[i]
                 
                 # 번역 결과를 원본 데이터에 추가
                 text_data_list = []
@@ -350,13 +698,14 @@ class ImprovedScreenTextTranslator:
                         'confidence': source_text_data['confidence']
                     })
                 
-                # 개선된 오버레이 프레임 생성
-                overlay_frame = self.create_improved_overlay_frame(frame, text_data_list)
+                tile, roi = self.create_overlay_tile(frame_size, text_data_list)
                 
                 processed_frames.append({
-                    'timestamp': frame_data['timestamp'],
-                    'frame': overlay_frame,
-                    'has_translation': True
+                    'timestamp': timestamp,
+                    'text_data_list': text_data_list,
+                    'tile': tile,
+                    'roi': roi,
+                    'has_translation': tile is not None
                 })
                 
                 print(f"   ✅ 번역 오버레이 완료")
@@ -364,73 +713,165 @@ class ImprovedScreenTextTranslator:
             else:
                 print(f"   ⚪ {self.source_language.upper()} 텍스트 없음")
                 processed_frames.append({
-                    'timestamp': frame_data['timestamp'],
-                    'frame': frame,
+                    'timestamp': timestamp,
+                    'text_data_list': [],
+                    'tile': None,
+                    'roi': None,
                     'has_translation': False
                 })
         
-        # 3. 처리된 프레임들로 비디오 생성
-        self.create_video_from_processed_frames_improved(video_path, processed_frames, output_path, start_time, end_time)
+        return processed_frames
+    
+    def build_overlay_intervals(self, processed_frames, start_time=None, end_time=None):
+        """
+        오버레이 표시 구간 계산
+        
+        각 번역 프레임의 오버레이는 다음 샘플 프레임 전까지 유지되며,
+        같은 번역 결과가 이어지는 구간은 하나로 합칩니다.
+        
+        Returns:
+            list: (구간 시작 초, 구간 끝 초, 처리된 프레임) 목록 (출력 영상 기준 시간)
+        """
+        offset = start_time or 0
+        intervals = []
+        
+        for i, pframe in enumerate(processed_frames):
+            if not pframe['has_translation']:
+                continue
+            
+            interval_start = pframe['timestamp'] - offset
+            if i + 1 < len(processed_frames):
+                interval_end = processed_frames[i + 1]['timestamp'] - offset
+            elif end_time is not None:
+                interval_end = end_time - offset
+            else:
+                interval_end = float('inf')
+            
+            previous = intervals[-1] if intervals else None
+            if previous and previous[2]['tile'] is pframe['tile'] and previous[1] == interval_start:
+                intervals[-1] = (previous[0], interval_end, previous[2])
+            else:
+                intervals.append((interval_start, interval_end, pframe))
         
-        return output_path
+        return intervals
     
-    def create_video_from_processed_frames_improved(self, original_video_path, processed_frames, output_path, start_time=None, end_time=None):
-        """개선된 비디오 생성"""
-        print("🎬 개선된 번역 오버레이 비디오 생성 중...")
+    def write_overlay_sequence(self, intervals, frame_size, overlay_dir):
+        """
+        오버레이 구간을 프레임 크기의 투명 PNG와 concat demuxer 목록(이미지별 표시 시간)으로 저장
+        
+        구간 사이의 빈 시간은 투명 이미지로 채우므로 구간이 많아도 ffmpeg 입력과 overlay 필터는 하나입니다.
+        overlay 필터는 입력이 끝나면 마지막 이미지를 계속 표시하므로, 끝나는 구간 뒤에는 투명 이미지를 둡니다.
+        
+        Returns:
+            Path: concat 목록 파일 경로
+        """
+        overlay_dir = Path(overlay_dir)
+        blank_path = overlay_dir / "blank.png"
+        Image.new('RGBA', frame_size, (0, 0, 0, 0)).save(blank_path)
+        
+        # 같은 타일(같은 화면이 다시 나온 경우)은 한 번만 저장
+        tile_paths = {}
+        entries = []
+        current_time = 0.0
+        for interval_start, interval_end, pframe in intervals:
+            if interval_start > current_time:
+                entries.append((blank_path, interval_start - current_time))
+            
+            tile_path = tile_paths.get(id(pframe['tile']))
+            if tile_path is None:
+                tile_path = overlay_dir / f"overlay_{len(tile_paths):05d}.png"
+                layer = Image.new('RGBA', frame_size, (0, 0, 0, 0))
+                layer.paste(pframe['tile'], tuple(pframe['roi']))
+                layer.save(tile_path)
+                tile_paths[id(pframe['tile'])] = tile_path
+            
+            entries.append((tile_path, interval_end - interval_start))
+            current_time = interval_end
         
-        # 원본 비디오 정보 가져오기
-        cap = cv2.VideoCapture(original_video_path)
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if current_time != float('inf'):
+            entries.append((blank_path, None))
         
-        # 구간 설정
-        if start_time is not None and end_time is not None:
-            start_frame = int(start_time * fps)
-            end_frame = int(end_time * fps)
-        else:
-            start_frame = 0
-            end_frame = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        lines = ["ffconcat version 1.0\n"]
+        for path, duration in entries:
+            lines.append(f"file '{path.name}'\n")
+            if duration is not None and duration != float('inf'):
+                lines.append(f"duration {duration:.6f}\n")
         
-        total_frames = end_frame - start_frame
+        concat_list = overlay_dir / "overlays.txt"
+        concat_list.write_text(''.join(lines), encoding='utf-8')
+        return concat_list
+    
+    def create_video_from_processed_frames_improved(self, original_video_path, processed_frames, output_path, start_time=None, end_time=None,
+                                                    subtitle_path=None, subtitle_style=None):
+        """
+        개선된 비디오 생성
+        
+        번역 오버레이를 구간별 표시 시간을 가진 PNG 이미지 목록(concat demuxer)으로 저장한 뒤,
+        ffmpeg overlay 필터 하나로 합성합니다.
+        파이썬에서 프레임을 하나씩 읽고 쓰지 않고 ffmpeg 한 번의 실행으로 인코딩합니다.
+        
+        Args:
+            subtitle_path: 함께 새길 음성 자막(SRT) 경로 - 같은 필터 그래프에서 처리되어 인코딩은 한 번만 수행
+            subtitle_style: 자막 force_style 문자열
+        """
+        print("🎬 개선된 번역 오버레이 비디오 생성 중...")
         
-        # 비디오 라이터 설정
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        # 구간 설정 (-ss를 입력 옵션으로 두어 빠른 탐색, 출력 시간은 0부터 시작)
+        input_options = {}
+        if start_time is not None and end_time is not None:
+            input_options = {'ss': start_time, 't': end_time - start_time}
         
-        # 프레임별 오버레이 맵 생성
-        overlay_map = {}
-        for pframe in processed_frames:
-            frame_num = int(pframe['timestamp'] * fps) - start_frame
-            overlay_map[frame_num] = pframe
+        intervals = self.build_overlay_intervals(processed_frames, start_time, end_time)
+        print(f"   🧩 오버레이 구간: {len(intervals)}개")
         
-        # 원본 비디오 구간을 순회하며 오버레이 적용
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        probe = ffmpeg.probe(str(original_video_path))
+        video_stream = next(stream for stream in probe['streams'] if stream['codec_type'] == 'video')
+        frame_size = (int(video_stream['width']), int(video_stream['height']))
         
-        current_overlay = None
-        for frame_num in range(total_frames):
-            ret, frame = cap.read()
-            if not ret:
-                break
+        temp_root = ensure_directory_exists(get_file_config()['temp_dir'])
+        with tempfile.TemporaryDirectory(prefix="overlays_", dir=temp_root) as overlay_dir:
+            source = ffmpeg.input(str(original_video_path), **input_options)
+            video = source.video
             
-            # 현재 프레임에 적용할 오버레이 확인
-            if frame_num in overlay_map:
-                current_overlay = overlay_map[frame_num]
+            if subtitle_path:
+                # 자막 시간은 원본 기준이므로 구간 처리 시 원본 시간으로 옮겨 새긴 뒤 다시 0부터 시작하도록 되돌림
+                if input_options:
+                    video = video.filter('setpts', f"PTS+{start_time}/TB")
+                subtitle_options = {'force_style': subtitle_style} if subtitle_style else {}
+                video = video.filter('subtitles', str(subtitle_path), **subtitle_options)
+                if input_options:
+                    video = video.filter('setpts', "PTS-STARTPTS")
             
-            # 오버레이 적용 (10초간 유지)
-            if current_overlay and current_overlay['has_translation']:
-                output_frame = current_overlay['frame']
-            else:
-                output_frame = frame
-            
-            out.write(output_frame)
+            if intervals:
+                concat_list = self.write_overlay_sequence(intervals, frame_size, overlay_dir)
+                video = ffmpeg.overlay(video, ffmpeg.input(str(concat_list), f='concat', safe=0))
             
-            if frame_num % (fps * 5) == 0:  # 5초마다 진행상황 출력
-                progress = (frame_num / total_frames) * 100
-                print(f"   📹 처리 중: {progress:.1f}%")
-        
-        cap.release()
-        out.release()
+            # 하드웨어 인코더(NVENC/VideoToolbox/QSV)를 우선 사용하고, 실패하면 libx264로 재시도
+            audio_options = get_mp4_audio_options(original_video_path)
+            encoder = select_h264_encoder()
+            for candidate in dict.fromkeys([encoder, 'libx264']):
+                try:
+                    (
+                        ffmpeg
+                        .output(
+                            video,
+                            source['a:0?'],
+                            str(output_path),
+                            movflags='+faststart',
+                            **audio_options,
+                            **get_h264_encoder_options(candidate, crf=23, preset='fast')
+                        )
+                        .overwrite_output()
+                        .run(capture_stdout=True, capture_stderr=True)
+                    )
+                    break
+                except ffmpeg.Error as e:
+                    if candidate == 'libx264':
+                        print(f"❌ 비디오 생성 실패: {e}")
+                        if e.stderr:
+                            print(f"FFmpeg 오류 세부 정보: {e.stderr.decode('utf-8')}")
+                        raise
+                    print(f"⚠️  {candidate} 인코딩 실패, libx264로 재시도...")
         
         print(f"✅ 개선된 번역 오버레이 비디오 생성 완료: {output_path}")
 
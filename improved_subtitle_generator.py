@@ -1,17 +1,210 @@
 #!/usr/bin/env python3
-import whisper
+import asyncio
+import functools
+import math
 import openai
+import tiktoken
+import numpy as np
 import json
 import os
+import time
 from pathlib import Path
 import ffmpeg
 import textwrap
-from file_utils import get_output_path, get_temp_file_path, get_segment_suffix, validate_input_format, get_default_input_path
+from file_utils import get_output_path, get_segment_suffix, validate_input_format, get_default_input_path, get_file_config, ensure_directory_exists
+from translation_cache import TranslationCache, TranslationJournal
+from whisper_utils import (
+    load_whisper_model, iter_transcribe_segments, get_transcription_worker_count,
+    create_transcription_pool, transcribe_window, shift_segment_times, WHISPER_WINDOW_SECONDS
+)
+from subtitle_utils import format_srt_timestamps, format_ass_timestamps
+from ffmpeg_utils import select_h264_encoder, get_h264_encoder_options, get_hwaccel_input_options, get_mp4_audio_options, decode_audio
 import sys
 
+# 자막 스타일 (작은 폰트, 깔끔한 디자인) - 스타일만 바꿀 때는 SUBTITLE_STYLE 설정 후 --style-only로 다시 적용
+SUBTITLE_FORCE_STYLE = os.getenv(
+    'SUBTITLE_STYLE',
+    "FontSize=14,PrimaryColour=&Hffffff,BackColour=&H80000000,OutlineColour=&H0,BorderStyle=3,MarginV=30"
+)
+
+# ASS [V4+ Styles] 필드 순서와 기본값 (ffmpeg가 SRT를 ASS로 변환할 때 쓰는 값과 동일)
+ASS_STYLE_DEFAULTS = {
+    'Name': 'Default', 'Fontname': 'Arial', 'Fontsize': '16',
+    'PrimaryColour': '&Hffffff', 'SecondaryColour': '&Hffffff', 'OutlineColour': '&H0', 'BackColour': '&H0',
+    'Bold': '0', 'Italic': '0', 'Underline': '0', 'StrikeOut': '0',
+    'ScaleX': '100', 'ScaleY': '100', 'Spacing': '0', 'Angle': '0',
+    'BorderStyle': '1', 'Outline': '1', 'Shadow': '0', 'Alignment': '2',
+    'MarginL': '10', 'MarginR': '10', 'MarginV': '10', 'Encoding': '0',
+}
+
+def build_ass_header(force_style=None):
+    """
+    force_style 형식 문자열("FontSize=14,MarginV=30")을 반영한 ASS 헤더 생성
+    (스타일을 파일에 직접 넣으므로 ffmpeg force_style 없이 같은 모양으로 렌더링)
+    """
+    if force_style is None:
+        force_style = SUBTITLE_FORCE_STYLE
+    
+    style = dict(ASS_STYLE_DEFAULTS)
+    field_names = {name.lower(): name for name in style}
+    for option in filter(None, force_style.split(',')):
+        key, _, value = option.partition('=')
+        style[field_names.get(key.strip().lower(), key.strip())] = value.strip()
+    
+    return (
+        "[Script Info]\n"
+        "ScriptType: v4.00+\n"
+        "PlayResX: 384\n"
+        "PlayResY: 288\n"
+        "ScaledBorderAndShadow: yes\n"
+        "\n"
+        "[V4+ Styles]\n"
+        f"Format: {', '.join(style)}\n"
+        f"Style: {','.join(style.values())}\n"
+        "\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    )
+
+# Whisper 입력 샘플레이트 (16kHz 모노)
+WHISPER_SAMPLE_RATE = 16000
+
+# 한 번의 번역 요청에 묶을 최대 세그먼트 수
+TRANSLATION_CHUNK_SIZE = 50
+
+# 요청 하나의 예상 출력 토큰 상한 (응답이 잘리지 않도록 세그먼트 수를 동적으로 조절)
+TRANSLATION_MAX_OUTPUT_TOKENS = 3000
+
+# JSON 응답에서 세그먼트 하나당 추가되는 키/구두점 토큰 수 (대략)
+TRANSLATION_JSON_OVERHEAD_TOKENS = 12
+
+# 동시에 진행할 최대 번역 요청 수
+TRANSLATION_MAX_CONCURRENCY = 10
+
+# 번역 모델과 요청 한도 (계정 등급에 맞게 환경변수로 조정)
+TRANSLATION_MODEL = "gpt-4o"
+OPENAI_MAX_RPM = int(os.getenv('OPENAI_MAX_RPM', '500'))
+OPENAI_MAX_TPM = int(os.getenv('OPENAI_MAX_TPM', '30000'))
+
+def parse_srt_time(timestamp):
+    """SRT 시간 문자열(HH:MM:SS,mmm)을 초로 변환"""
+    hours, minutes, seconds = timestamp.strip().replace(',', '.').split(':')
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+class _ParallelTranslator:
+    """
+    분당 요청 수(RPM)와 토큰 수(TPM) 한도 안에서 번역 요청을 병렬로 처리
+    
+    요청마다 토큰 수를 미리 추정해 용량을 차감하고, 용량은 시간에 비례해 다시 채워집니다.
+    429(RateLimitError) 응답 시 지수 백오프 동안 모든 요청을 멈춘 뒤 재시도합니다.
+    """
+    
+    def __init__(self, client, model=TRANSLATION_MODEL, max_requests_per_minute=OPENAI_MAX_RPM,
+                 max_tokens_per_minute=OPENAI_MAX_TPM, max_concurrency=TRANSLATION_MAX_CONCURRENCY,
+                 max_attempts=3, base_backoff_seconds=2.0):
+        self.client = client
+        self.model = model
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        
+        self.available_request_capacity = max_requests_per_minute
+        self.available_token_capacity = max_tokens_per_minute
+        self.last_update_time = time.monotonic()
+        self.next_request_time = self.last_update_time
+        
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # 토크나이저 사전을 받을 수 없는 환경(오프라인 등)에서는 글자 수로 추정
+        try:
+            self._encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            print(f"⚠️  토크나이저 로드 실패, 글자 수로 토큰 추정: {e}")
+            self._encoding = None
+    
+    def count_tokens(self, text):
+        """텍스트 토큰 수 (토크나이저가 없으면 글자 수 - CJK 기준 보수적 추정)"""
+        if self._encoding is None:
+            return len(text)
+        return len(self._encoding.encode(text))
+    
+    def estimate_tokens(self, messages):
+        """요청 토큰 수 추정 (프롬프트 + 비슷한 길이의 번역 응답)"""
+        prompt_tokens = sum(self.count_tokens(message['content']) + 4 for message in messages)
+        return min(prompt_tokens * 2, self.max_tokens_per_minute)
+    
+    def _refill_capacity(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.available_request_capacity = min(
+            self.max_requests_per_minute,
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60
+        )
+        self.available_token_capacity = min(
+            self.max_tokens_per_minute,
+            self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60
+        )
+        self.last_update_time = now
+        return now
+    
+    async def _acquire_capacity(self, token_cost):
+        """요청 1개와 token_cost만큼의 용량이 생길 때까지 대기 후 차감"""
+        while True:
+            async with self._lock:
+                now = self._refill_capacity()
+                if (now >= self.next_request_time
+                        and self.available_request_capacity >= 1
+                        and self.available_token_capacity >= token_cost):
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= token_cost
+                    return
+                
+                # 부족한 용량이 채워지는 데 필요한 시간만큼 대기
+                wait_seconds = max(
+                    self.next_request_time - now,
+                    (1 - self.available_request_capacity) * 60 / self.max_requests_per_minute,
+                    (token_cost - self.available_token_capacity) * 60 / self.max_tokens_per_minute,
+                    0.01
+                )
+            await asyncio.sleep(wait_seconds)
+    
+    async def request(self, messages, **options):
+        """
+        채팅 요청 1개를 한도 안에서 실행하고 응답 텍스트 반환 (실패 시 마지막 예외 발생)
+        
+        options는 chat.completions.create에 그대로 전달됩니다 (예: response_format).
+        """
+        token_cost = self.estimate_tokens(messages)
+        
+        for attempt in range(1, self.max_attempts + 1):
+            await self._acquire_capacity(token_cost)
+            try:
+                async with self._semaphore:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        **options
+                    )
+                return response.choices[0].message.content
+            except openai.RateLimitError:
+                if attempt == self.max_attempts:
+                    raise
+                backoff = self.base_backoff_seconds * (2 ** (attempt - 1))
+                print(f"⏳ 요청 한도 초과, {backoff:.1f}초 후 재시도 ({attempt}/{self.max_attempts})")
+                async with self._lock:
+                    self.next_request_time = max(self.next_request_time, time.monotonic() + backoff)
+
 class ImprovedSubtitleGenerator:
     def __init__(self, openai_api_key=None, source_language=None, target_language=None):
         self.whisper_model = None
+        self.whisper_model_size = "large"
+        
+        # 번역 디스크 캐시 (첫 번역 시 연결)
+        self.translation_cache = None
         
         # 언어 설정 (환경변수에서 기본값 읽기)
         self.source_language = source_language or os.getenv('SOURCE_LANGUAGE', 'ja')
@@ -27,9 +220,29 @@ class ImprovedSubtitleGenerator:
     def load_whisper_model(self, model_size="large"):
         """Whisper 모델 로드"""
         print(f"Whisper {model_size} 모델 로딩 중...")
-        self.whisper_model = whisper.load_model(model_size)
+        self.whisper_model_size = model_size
+        self.whisper_model = load_whisper_model(model_size)
         print("✅ Whisper 모델 로드 완료")
     
+    def load_audio(self, video_path, start_time=None, end_time=None):
+        """
+        ffmpeg로 오디오를 16kHz 모노 float32로 디코딩해 파이프로 바로 읽음
+        (임시 WAV 파일을 쓰고 Whisper가 다시 디코딩하는 과정 생략, 구간은 -i 앞 -ss로 빠르게 탐색)
+        
+        Returns:
+            numpy.ndarray: float32 오디오 샘플 (-1.0 ~ 1.0)
+        """
+        if start_time is not None and end_time is not None:
+            segment_options = {'start_time': start_time, 'duration': end_time - start_time}
+        else:
+            segment_options = {}
+        
+        try:
+            return decode_audio(video_path, sample_rate=WHISPER_SAMPLE_RATE, **segment_options)
+        except ffmpeg.Error as e:
+            print(f"❌ 오디오 추출 실패: {e.stderr.decode('utf-8', errors='ignore') if e.stderr else e}")
+            raise
+    
     def transcribe_audio(self, video_path, start_time=None, end_time=None):
         """음성을 텍스트로 변환 (구간 지정 가능)"""
         if not self.whisper_model:
@@ -38,175 +251,528 @@ class ImprovedSubtitleGenerator:
         # 구간 지정된 경우 해당 부분만 추출
         if start_time is not None and end_time is not None:
             print(f"🎤 {self.source_language.upper()} 음성 인식 중 ({start_time}초 ~ {end_time}초)...")
-            # 임시 파일로 구간 추출
-            temp_audio = str(get_temp_file_path("audio_segment", ".wav"))
-            (
-                ffmpeg
-                .input(video_path, ss=start_time, t=end_time-start_time)
-                .output(temp_audio, acodec='pcm_s16le')
-                .overwrite_output()
-                .run(capture_stdout=True)
-            )
-            
-            result = self.whisper_model.transcribe(
-                temp_audio,
-                language=self.source_language,
-                word_timestamps=True,
-                verbose=True
-            )
-            
-            # 타임스탬프 조정 (시작 시간 추가)
-            for segment in result['segments']:
-                segment['start'] += start_time
-                segment['end'] += start_time
-            
-            # 임시 파일 삭제
-            if os.path.exists(temp_audio):
-                os.remove(temp_audio)
         else:
             print(f"🎤 {self.source_language.upper()} 음성 인식 중...")
-            result = self.whisper_model.transcribe(
-                video_path,
-                language=self.source_language,
-                word_timestamps=True,
-                verbose=True
-            )
+        
+        audio = self.load_audio(video_path, start_time, end_time)
+        
+        result = self.whisper_model.transcribe(
+            audio,
+            language=self.source_language,
+            word_timestamps=True,
+            verbose=False
+        )
+        
+        # 타임스탬프 조정 (시작 시간 추가, 단어 타임스탬프 포함)
+        if start_time is not None and end_time is not None:
+            for segment in result['segments']:
+                shift_segment_times(segment, start_time)
         
         print(f"✅ 음성 인식 완료: {len(result['segments'])}개 세그먼트")
         return result
     
-    def translate_text_batch(self, texts):
-        """텍스트 배치 번역"""
+    def build_batch_messages(self, texts):
+        """
+        JSON 모드 배치 번역 요청 메시지 생성
+        
+        각 텍스트에 인덱스(i)를 붙여 보내고 같은 인덱스로 돌려받으므로
+        구분자 분할이나 순서 뒤바뀜 문제가 없습니다.
+        """
+        payload = json.dumps(
+            {"t": [{"i": i, "text": text} for i, text in enumerate(texts)]},
+            ensure_ascii=False
+        )
+        return [
+            {
+                "role": "system",
+                "content": f"""당신은 전문 번역가입니다. 
+                AI/기술 관련 세미나 발표 내용을 번역합니다.
+                {self.source_language.upper()}를 자연스러운 {self.target_language}로 번역하되, 기술 용어는 적절히 유지하세요.
+                간결하고 읽기 쉽게 번역하세요.
+                입력과 같은 i 값을 유지하여 {{"t": [{{"i": 0, "text": "번역문"}}, ...]}} 형식의 JSON으로만 응답하세요."""
+            },
+            {
+                "role": "user", 
+                "content": f"다음 {self.source_language.upper()} 텍스트를 {self.target_language}로 번역해주세요:\n\n{payload}"
+            }
+        ]
+    
+    def parse_batch_response(self, content, count):
+        """
+        JSON 모드 응답을 인덱스별 번역으로 변환
+        
+        Returns:
+            list: 길이 count의 번역 목록 (응답에 없는 인덱스는 None, 응답이 잘린 경우 모두 None)
+        """
+        translations = [None] * count
+        try:
+            items = json.loads(content).get("t", [])
+        except (json.JSONDecodeError, AttributeError):
+            return translations
+        
+        for item in items:
+            try:
+                index = int(item["i"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < count and isinstance(item.get("text"), str):
+                translations[index] = item["text"]
+        return translations
+    
+    def build_translation_chunks(self, texts, count_tokens, max_chunk_size=TRANSLATION_CHUNK_SIZE):
+        """
+        예상 출력 토큰이 TRANSLATION_MAX_OUTPUT_TOKENS를 넘지 않도록 텍스트를 묶음으로 분할
+        (번역문 길이는 원문과 비슷하다고 가정)
+        """
+        chunks = []
+        current_chunk = []
+        current_tokens = 0
+        
+        for text in texts:
+            text_tokens = count_tokens(text) + TRANSLATION_JSON_OVERHEAD_TOKENS
+            if current_chunk and (len(current_chunk) >= max_chunk_size
+                                  or current_tokens + text_tokens > TRANSLATION_MAX_OUTPUT_TOKENS):
+                chunks.append(current_chunk)
+                current_chunk = []
+                current_tokens = 0
+            current_chunk.append(text)
+            current_tokens += text_tokens
+        
+        if current_chunk:
+            chunks.append(current_chunk)
+        return chunks
+    
+    def build_single_messages(self, text):
+        """단일 텍스트 번역 요청 메시지 생성"""
+        return [
+            {"role": "system", "content": f"{self.source_language.upper()}를 자연스럽고 간결한 {self.target_language}로 번역하세요."},
+            {"role": "user", "content": text}
+        ]
+    
+    def get_translation_cache(self):
+        """번역 디스크 캐시 (처음 사용할 때 연결)"""
+        if self.translation_cache is None:
+            self.translation_cache = TranslationCache()
+        return self.translation_cache
+    
+    def translate_text_batch(self, texts, max_chunk_size=TRANSLATION_CHUNK_SIZE, max_concurrency=TRANSLATION_MAX_CONCURRENCY):
+        """
+        텍스트 배치 번역
+        
+        세그먼트를 출력 토큰 기준으로 묶어(최대 max_chunk_size개) JSON 모드 요청을 AsyncOpenAI로 동시에 보냅니다.
+        동시 요청 수는 max_concurrency로, 분당 요청/토큰 수는 OPENAI_MAX_RPM/OPENAI_MAX_TPM으로
+        제한하며, 결과는 입력 순서를 유지합니다.
+        """
         if not openai.api_key:
             print("⚠️  OpenAI API 키가 없어 번역을 건너뜁니다.")
             return [f"[번역 필요] {text}" for text in texts]
         
+        if not texts:
+            return []
+        
         print(f"🌐 {self.source_language.upper()} → {self.target_language} 번역 중...")
+        translated_texts = asyncio.run(self._translate_texts_async(texts, max_chunk_size, max_concurrency))
         
-        # 배치로 번역 (비용 절약)
-        batch_text = "\n---\n".join(texts)
+        print(f"✅ 번역 완료: {len(translated_texts)}개 문장")
+        return translated_texts
+    
+    async def _translate_texts_async(self, texts, max_chunk_size, max_concurrency):
+        # 하나의 클라이언트(HTTP 연결 풀)와 요청 한도를 모든 요청이 공유
+        client = openai.AsyncOpenAI(api_key=openai.api_key)
+        translator = _ParallelTranslator(client, max_concurrency=max_concurrency)
         
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"""당신은 전문 번역가입니다. 
-                        AI/기술 관련 세미나 발표 내용을 번역합니다.
-                        {self.source_language.upper()}를 자연스러운 {self.target_language}로 번역하되, 기술 용어는 적절히 유지하세요.
-                        각 문장은 '---'로 구분되어 있습니다.
-                        간결하고 읽기 쉽게 번역하세요."""
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"다음 {self.source_language.upper()} 텍스트를 {self.target_language}로 번역해주세요:\n\n{batch_text}"
-                    }
-                ]
-            )
+            return await self._translate_cached_async(translator, texts, max_chunk_size)
+        finally:
+            await client.close()
+    
+    async def _translate_cached_async(self, translator, texts, max_chunk_size=TRANSLATION_CHUNK_SIZE):
+        """
+        캐시에 있는 번역은 재사용하고, 나머지 텍스트는 중복을 제거해 한 번씩만 동시에 요청
+        
+        Returns:
+            list: 입력 순서대로 정렬된 번역 목록
+        """
+        cache = self.get_translation_cache()
+        translations = cache.get_many(self.source_language, self.target_language, texts)
+        texts_to_translate = list(dict.fromkeys(text for text in texts if text not in translations))
+        print(f"💾 번역 캐시 적중: {sum(text in translations for text in texts)}/{len(texts)}개, 새로 번역할 문장: {len(texts_to_translate)}개")
+        
+        if texts_to_translate:
+            async def translate_and_store(chunk):
+                chunk_translations = await self._translate_chunk_async(translator, chunk)
+                # 묶음이 끝나는 대로 저장 (중간에 중단되어도 끝난 묶음은 유지,
+                # 실패한 번역은 다음 실행에서 다시 시도하도록 저장하지 않음)
+                cache.put_many(self.source_language, self.target_language, {
+                    text: translation for text, translation in zip(chunk, chunk_translations)
+                    if not translation.startswith("[번역 실패]")
+                })
+                return chunk_translations
             
-            translated_batch = response.choices[0].message.content
-            translated_texts = translated_batch.split("\n---\n")
+            chunks = self.build_translation_chunks(texts_to_translate, translator.count_tokens, max_chunk_size)
+            chunk_translations = await asyncio.gather(*(translate_and_store(chunk) for chunk in chunks))
+            translations.update(zip(
+                texts_to_translate,
+                [translation for chunk in chunk_translations for translation in chunk]
+            ))
+        
+        return [translations[text] for text in texts]
+    
+    async def _translate_segments_async(self, translator, segments, journal=None):
+        """세그먼트 묶음을 번역하고 진행 기록에 바로 추가 (실패한 번역은 기록하지 않음)"""
+        translations = await self._translate_cached_async(translator, [segment['text'] for segment in segments])
+        
+        if journal is not None:
+            succeeded = [
+                (segment, translation) for segment, translation in zip(segments, translations)
+                if not translation.startswith("[번역 실패]")
+            ]
+            journal.append([segment for segment, _ in succeeded], [translation for _, translation in succeeded])
+        return translations
+    
+    def get_translation_journal(self, video_path, start_time=None, end_time=None):
+        """영상(구간)별 진행 기록: CACHE_DIR/{영상 이름}{구간}.translations.jsonl"""
+        cache_dir = ensure_directory_exists(get_file_config()['cache_dir'])
+        segment_info = get_segment_suffix(start_time, end_time)
+        return TranslationJournal(cache_dir / f"{Path(video_path).stem}{segment_info}.translations.jsonl")
+    
+    def transcribe_and_translate(self, video_path, start_time=None, end_time=None, max_concurrency=TRANSLATION_MAX_CONCURRENCY, journal=None):
+        """
+        음성 인식과 번역을 겹쳐서 실행
+        
+        Whisper가 별도 스레드에서 세그먼트를 내보내는 대로 번역 묶음을 만들어 바로 요청하므로,
+        전체 소요 시간이 (인식 + 번역)이 아니라 대략 max(인식, 번역)이 됩니다.
+        
+        Args:
+            journal: 진행 기록 (TranslationJournal). 이전 실행에서 기록된 세그먼트는 재사용하고
+                     마지막 세그먼트 끝부터 이어서 인식하며, 번역 묶음이 끝날 때마다 기록을 추가합니다.
+        
+        Returns:
+            tuple: (세그먼트 목록, 세그먼트 순서대로 정렬된 번역 목록)
+        """
+        if not openai.api_key:
+            transcription = self.transcribe_audio(video_path, start_time, end_time)
+            segments = transcription['segments']
+            return segments, self.translate_text_batch([segment['text'] for segment in segments])
+        
+        if start_time is not None and end_time is not None:
+            print(f"🎤 {self.source_language.upper()} 음성 인식 + {self.target_language} 번역 중 ({start_time}초 ~ {end_time}초)...")
+        else:
+            print(f"🎤 {self.source_language.upper()} 음성 인식 + {self.target_language} 번역 중...")
+        
+        audio = self.load_audio(video_path, start_time, end_time)
+        offset = start_time if start_time is not None and end_time is not None else 0
+        
+        # 중단된 이전 실행에서 번역까지 끝난 세그먼트는 재사용하고 그 뒤부터 이어서 인식
+        resumed_entries = journal.load() if journal is not None else []
+        if resumed_entries:
+            resume_time = resumed_entries[-1]['end']
+            audio = audio[int(round((resume_time - offset) * WHISPER_SAMPLE_RATE)):]
+            offset = resume_time
+            print(f"♻️  이전 작업 이어서 진행: {len(resumed_entries)}개 세그먼트 재사용 ({resume_time:.1f}초부터 인식)")
+        
+        first_id = len(resumed_entries)
+        
+        # 긴 오디오는 구간으로 나눠 여러 프로세스(GPU)에서 동시에 인식 (구간 수보다 많은 프로세스는 띄우지 않음)
+        window_count = math.ceil(len(audio) / (WHISPER_WINDOW_SECONDS * WHISPER_SAMPLE_RATE))
+        workers = min(get_transcription_worker_count(), window_count)
+        if len(audio) == 0:
+            segments, translated_texts = [], []
+        elif workers > 1:
+            segments, translated_texts = asyncio.run(
+                self._transcribe_windows_and_translate_async(audio, offset, workers, max_concurrency, first_id, journal)
+            )
+        else:
+            if not self.whisper_model:
+                self.load_whisper_model()
+            segments, translated_texts = asyncio.run(
+                self._transcribe_and_translate_async(audio, offset, max_concurrency, first_id, journal)
+            )
+        
+        segments = [
+            {'id': entry['id'], 'start': entry['start'], 'end': entry['end'], 'text': entry['src']}
+            for entry in resumed_entries
+        ] + segments
+        translated_texts = [entry['text'] for entry in resumed_entries] + translated_texts
+        
+        print(f"✅ 음성 인식 및 번역 완료: {len(segments)}개 세그먼트")
+        return segments, translated_texts
+    
+    async def _transcribe_and_translate_async(self, audio, offset, max_concurrency, first_id=0, journal=None):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        
+        def transcribe_segments():
+            # Whisper를 스레드에서 실행하고 세그먼트가 나올 때마다 이벤트 루프의 큐로 전달
+            try:
+                for segment in iter_transcribe_segments(
+                    self.whisper_model,
+                    audio,
+                    language=self.source_language,
+                    word_timestamps=True,
+                    verbose=False
+                ):
+                    # 타임스탬프 조정 (시작 시간 추가, 단어 타임스탬프 포함)
+                    loop.call_soon_threadsafe(queue.put_nowait, shift_segment_times(segment, offset))
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+        
+        client = openai.AsyncOpenAI(api_key=openai.api_key)
+        translator = _ParallelTranslator(client, max_concurrency=max_concurrency)
+        
+        segments = []
+        translation_tasks = []
+        pending_segments = []
+        pending_tokens = 0
+        
+        transcription = loop.run_in_executor(None, transcribe_segments)
+        try:
+            while True:
+                segment = await queue.get()
+                if segment is None:
+                    break
+                segment['id'] = first_id + len(segments)
+                segments.append(segment)
+                
+                # 묶음이 가득 차면 인식을 기다리지 않고 바로 번역 요청
+                text_tokens = translator.count_tokens(segment['text']) + TRANSLATION_JSON_OVERHEAD_TOKENS
+                if pending_segments and (len(pending_segments) >= TRANSLATION_CHUNK_SIZE
+                                         or pending_tokens + text_tokens > TRANSLATION_MAX_OUTPUT_TOKENS):
+                    translation_tasks.append(asyncio.create_task(
+                        self._translate_segments_async(translator, pending_segments, journal)
+                    ))
+                    pending_segments = []
+                    pending_tokens = 0
+                pending_segments.append(segment)
+                pending_tokens += text_tokens
             
-            # 원본과 번역본 개수 맞추기
-            if len(translated_texts) != len(texts):
-                print("⚠️  번역 개수가 맞지 않습니다. 개별 번역으로 재시도...")
-                return [self.translate_single_text(text) for text in texts]
+            # 인식 중 발생한 예외 전달
+            await transcription
             
-            print(f"✅ 번역 완료: {len(translated_texts)}개 문장")
-            return translated_texts
+            if pending_segments:
+                translation_tasks.append(asyncio.create_task(
+                    self._translate_segments_async(translator, pending_segments, journal)
+                ))
             
+            chunk_translations = await asyncio.gather(*translation_tasks)
+        except BaseException:
+            for task in translation_tasks:
+                task.cancel()
+            raise
+        finally:
+            await client.close()
+        
+        return segments, [translation for chunk in chunk_translations for translation in chunk]
+    
+    async def _translate_chunk_async(self, translator, texts):
+        """세그먼트 묶음 하나를 번역 (응답에 빠진 세그먼트만 개별 번역으로 다시 요청)"""
+        try:
+            content = await translator.request(
+                self.build_batch_messages(texts),
+                response_format={"type": "json_object"}
+            )
         except Exception as e:
             print(f"❌ 번역 오류: {e}")
             return [f"[번역 실패] {text}" for text in texts]
+        
+        translated_texts = self.parse_batch_response(content, len(texts))
+        
+        missing = [i for i, translation in enumerate(translated_texts) if translation is None]
+        if not missing:
+            return translated_texts
+        
+        print(f"⚠️  응답에 빠진 번역 {len(missing)}개, 개별 번역으로 재시도...")
+        
+        async def translate_single(text):
+            try:
+                return await translator.request(self.build_single_messages(text))
+            except Exception:
+                return f"[번역 실패] {text}"
+        
+        retried = await asyncio.gather(*(translate_single(texts[i]) for i in missing))
+        for i, translation in zip(missing, retried):
+            translated_texts[i] = translation
+        return translated_texts
     
-    def translate_single_text(self, text):
-        """단일 텍스트 번역"""
+    async def _transcribe_windows_and_translate_async(self, audio, offset, workers, max_concurrency, first_id=0, journal=None):
+        """
+        오디오를 WHISPER_WINDOW_SECONDS 구간으로 나눠 프로세스 풀에서 병렬 인식하고,
+        구간 인식이 끝나는 대로 해당 구간 번역을 요청 (결과는 구간 순서대로 이어 붙임)
+        
+        세그먼트 번호는 앞 구간들이 모두 끝나야 정해지므로, 진행 기록은 앞 구간부터 순서대로 추가합니다.
+        """
+        loop = asyncio.get_running_loop()
+        window_samples = WHISPER_WINDOW_SECONDS * WHISPER_SAMPLE_RATE
+        window_starts = range(0, len(audio), window_samples)
+        print(f"🧩 {len(window_starts)}개 구간을 {workers}개 프로세스로 병렬 인식")
+        
+        client = openai.AsyncOpenAI(api_key=openai.api_key)
+        translator = _ParallelTranslator(client, max_concurrency=max_concurrency)
+        
+        window_results = [None] * len(window_starts)
+        journaled = {'windows': 0, 'next_id': first_id}
+        
+        def journal_finished_windows():
+            # 앞 구간이 모두 끝난 구간까지 번호를 매겨 기록
+            while journaled['windows'] < len(window_results) and window_results[journaled['windows']] is not None:
+                window_segments, window_translations = window_results[journaled['windows']]
+                for segment in window_segments:
+                    segment['id'] = journaled['next_id']
+                    journaled['next_id'] += 1
+                if journal is not None:
+                    succeeded = [
+                        (segment, translation) for segment, translation in zip(window_segments, window_translations)
+                        if not translation.startswith("[번역 실패]")
+                    ]
+                    journal.append([segment for segment, _ in succeeded], [translation for _, translation in succeeded])
+                journaled['windows'] += 1
+        
+        async def process_window(pool, window_index, window_start):
+            window_offset = offset + window_start / WHISPER_SAMPLE_RATE
+            segments = await loop.run_in_executor(pool, functools.partial(
+                transcribe_window,
+                self.whisper_model_size,
+                audio[window_start:window_start + window_samples],
+                window_offset,
+                language=self.source_language,
+                word_timestamps=True
+            ))
+            print(f"   ✅ {window_offset:.0f}초 구간 인식 완료: {len(segments)}개 세그먼트")
+            
+            translations = []
+            if segments:
+                translations = await self._translate_cached_async(translator, [segment['text'] for segment in segments])
+            window_results[window_index] = (segments, translations)
+            journal_finished_windows()
+        
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": f"{self.source_language.upper()}를 자연스럽고 간결한 {self.target_language}로 번역하세요."},
-                    {"role": "user", "content": text}
-                ]
-            )
-            return response.choices[0].message.content
-        except:
-            return f"[번역 실패] {text}"
+            with create_transcription_pool(workers) as pool:
+                await asyncio.gather(*(
+                    process_window(pool, window_index, window_start)
+                    for window_index, window_start in enumerate(window_starts)
+                ))
+        finally:
+            await client.close()
+        
+        segments = [segment for window_segments, _ in window_results for segment in window_segments]
+        translated_texts = [translation for _, window_translations in window_results for translation in window_translations]
+        return segments, translated_texts
     
     def split_long_subtitle(self, text, max_chars=40):
         """긴 자막을 여러 줄로 분할"""
         if len(text) <= max_chars:
             return [text]
         
-        # 단어 단위로 분할 시도
+        # 단어 단위로 분할 시도 (줄 길이는 정수로 누적하고 줄이 끝날 때만 문자열 결합)
         words = text.split()
         lines = []
-        current_line = ""
+        current_words = []
+        current_length = 0
         
         for word in words:
-            if len(current_line + " " + word) <= max_chars:
-                current_line += (" " + word) if current_line else word
+            needed = len(word) + (1 if current_words else 0)
+            if current_length + needed <= max_chars:
+                current_words.append(word)
+                current_length += needed
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
+                if current_words:
+                    lines.append(" ".join(current_words))
+                current_words = [word]
+                current_length = len(word)
         
-        if current_line:
-            lines.append(current_line)
+        if current_words:
+            lines.append(" ".join(current_words))
         
         return lines[:3]  # 최대 3줄로 제한
     
     def create_improved_srt_file(self, segments, translations, output_path):
-        """개선된 SRT 자막 파일 생성 (번역어만, 작은 폰트, 긴 자막 분할)"""
+        """
+        개선된 SRT 자막 파일 생성 (번역어만, 작은 폰트, 긴 자막 분할)
+        스타일을 넣은 같은 이름의 ASS 파일도 함께 생성
+        """
         print("📝 개선된 SRT 자막 파일 생성 중...")
         
+        entries = self.build_subtitle_entries(segments, translations)
+        
+        # 시간 변환은 배열로 한 번에, 파일 쓰기도 한 번에
+        start_times = format_srt_timestamps([entry[0] for entry in entries])
+        end_times = format_srt_timestamps([entry[1] for entry in entries])
+        srt_blocks = [
+            f"{index}\n{start_time} --> {end_time}\n{text}\n\n"
+            for index, (start_time, end_time, (_, _, text)) in enumerate(zip(start_times, end_times, entries), 1)
+        ]
+        
         with open(output_path, 'w', encoding='utf-8') as f:
-            subtitle_index = 1
-            
-            for segment, translation in zip(segments, translations):
-                # 긴 자막 분할
-                lines = self.split_long_subtitle(translation.strip())
-                segment_duration = segment['end'] - segment['start']
-                
-                if len(lines) == 1:
-                    # 단일 라인 자막
-                    start_time = self.seconds_to_srt_time(segment['start'])
-                    end_time = self.seconds_to_srt_time(segment['end'])
-                    
-                    f.write(f"{subtitle_index}\n")
-                    f.write(f"{start_time} --> {end_time}\n")
-                    f.write(f"{lines[0]}\n\n")
-                    subtitle_index += 1
-                
-                else:
-                    # 여러 라인으로 분할된 자막
-                    line_duration = segment_duration / len(lines)
-                    
-                    for i, line in enumerate(lines):
-                        line_start = segment['start'] + (i * line_duration)
-                        line_end = segment['start'] + ((i + 1) * line_duration)
-                        
-                        start_time = self.seconds_to_srt_time(line_start)
-                        end_time = self.seconds_to_srt_time(line_end)
-                        
-                        f.write(f"{subtitle_index}\n")
-                        f.write(f"{start_time} --> {end_time}\n")
-                        f.write(f"{line}\n\n")
-                        subtitle_index += 1
+            f.write("".join(srt_blocks))
         
+        self.create_ass_file(entries, Path(output_path).with_suffix('.ass'))
         print(f"✅ 개선된 SRT 파일 생성 완료: {output_path}")
     
+    def build_subtitle_entries(self, segments, translations):
+        """자막 항목 (시작 초, 끝 초, 텍스트) 목록 생성 (긴 자막은 여러 항목으로 분할)"""
+        entries = []
+        for segment, translation in zip(segments, translations):
+            # 긴 자막 분할
+            lines = self.split_long_subtitle(translation.strip())
+            
+            if len(lines) == 1:
+                # 단일 라인 자막
+                entries.append((segment['start'], segment['end'], lines[0]))
+            else:
+                # 여러 라인으로 분할된 자막
+                line_duration = (segment['end'] - segment['start']) / len(lines)
+                for i, line in enumerate(lines):
+                    entries.append((
+                        segment['start'] + (i * line_duration),
+                        segment['start'] + ((i + 1) * line_duration),
+                        line
+                    ))
+        return entries
+    
+    def create_ass_file(self, entries, output_path, force_style=None):
+        """
+        스타일이 [V4+ Styles]에 들어간 ASS 자막 파일 생성
+        
+        Args:
+            entries: (시작 초, 끝 초, 텍스트) 목록
+            force_style: force_style 형식 스타일 문자열 (None이면 SUBTITLE_FORCE_STYLE)
+        """
+        start_times = format_ass_timestamps([entry[0] for entry in entries])
+        end_times = format_ass_timestamps([entry[1] for entry in entries])
+        # ASS는 줄바꿈을 \N으로 표기
+        texts = [entry[2].replace("\n", "\\N") for entry in entries]
+        dialogue_lines = [
+            f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
+            for start_time, end_time, text in zip(start_times, end_times, texts)
+        ]
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(build_ass_header(force_style) + "".join(dialogue_lines))
+        return output_path
+    
+    def read_srt_entries(self, srt_path):
+        """SRT 파일을 (시작 초, 끝 초, 텍스트) 목록으로 읽기"""
+        with open(srt_path, encoding='utf-8') as f:
+            blocks = f.read().strip().split("\n\n")
+        
+        entries = []
+        for block in blocks:
+            lines = block.strip().split("\n")
+            if len(lines) < 3 or ' --> ' not in lines[1]:
+                continue
+            start_time, end_time = lines[1].split(' --> ')
+            entries.append((parse_srt_time(start_time), parse_srt_time(end_time), "\n".join(lines[2:])))
+        return entries
+    
     def seconds_to_srt_time(self, seconds):
         """초를 SRT 시간 형식으로 변환"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millisecs = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+        return format_srt_timestamps([seconds])[0]
     
     def embed_improved_subtitles_to_video(self, video_path, srt_path, output_path):
-        """개선된 자막을 비디오에 하드코딩 (작은 폰트, 번역어만)"""
+        """
+        개선된 자막을 비디오에 하드코딩 (작은 폰트, 번역어만)
+        ASS 파일이면 파일에 들어 있는 스타일을, SRT 파일이면 SUBTITLE_FORCE_STYLE을 적용
+        """
         print("🎬 개선된 자막을 비디오에 삽입 중...")
         
         try:
@@ -219,37 +785,128 @@ class ImprovedSubtitleGenerator:
             srt_path_escaped = srt_path.replace('\\', '\\\\').replace(':', '\\:')
             
             # 개선된 자막 스타일 (작은 폰트, 깔끔한 디자인)
-            subtitle_filter = f"subtitles='{srt_path_escaped}':force_style='FontSize=14,PrimaryColour=&Hffffff,BackColour=&H80000000,OutlineColour=&H0,BorderStyle=3,MarginV=30'"
+            if srt_path.endswith('.ass'):
+                subtitle_filter = f"ass='{srt_path_escaped}'"
+            else:
+                subtitle_filter = f"subtitles='{srt_path_escaped}':force_style='{SUBTITLE_FORCE_STYLE}'"
+            
+            # 자막은 비디오에만 적용되므로 오디오는 가능하면 재인코딩 없이 복사
+            audio_options = get_mp4_audio_options(video_path)
             
+            # 하드웨어 인코더(NVENC/VideoToolbox/QSV)를 우선 사용하고, 실패하면 libx264로 재시도
+            encoder = select_h264_encoder()
+            try:
+                self._burn_in_subtitles(video_path, output_path, subtitle_filter, encoder, audio_options)
+            except ffmpeg.Error:
+                if encoder == 'libx264':
+                    raise
+                print(f"⚠️  {encoder} 인코딩 실패, libx264로 재시도...")
+                self._burn_in_subtitles(video_path, output_path, subtitle_filter, 'libx264', audio_options)
+            
+            print(f"✅ 개선된 자막 포함 비디오 생성 완료: {output_path}")
+            return True
+            
+        except ffmpeg.Error as e:
+            print(f"❌ 자막 삽입 실패: {e}")
+            if e.stderr:
+                print(f"FFmpeg 오류 세부 정보: {e.stderr.decode('utf-8')}")
+            return False
+        except Exception as e:
+            print(f"❌ 예상치 못한 오류: {e}")
+            return False
+    
+    def embed_soft_subtitles(self, video_path, srt_path, output_path):
+        """
+        SRT/ASS를 mov_text 자막 트랙으로 추가 (영상은 재인코딩 없이 복사하므로 수 초 안에 완료)
+        플레이어에서 자막을 켜고 끌 수 있으며, 화면에 직접 새기려면 embed_improved_subtitles_to_video 사용
+        (ASS를 넣으면 Default 스타일의 글꼴/크기/색상이 mov_text 기본 스타일로 옮겨짐)
+        """
+        print("🎬 자막 트랙을 비디오에 추가 중 (재인코딩 없음)...")
+        
+        try:
             (
                 ffmpeg
-                .input(video_path)
                 .output(
-                    output_path,
-                    vf=subtitle_filter,
-                    vcodec='libx264',
-                    acodec='aac',
-                    crf=20,  # 좋은 품질
-                    preset='medium'
+                    ffmpeg.input(str(video_path)),
+                    ffmpeg.input(str(srt_path)),
+                    str(output_path),
+                    vcodec='copy',
+                    scodec='mov_text',
+                    movflags='+faststart',
+                    **get_mp4_audio_options(video_path)
                 )
                 .overwrite_output()
                 .run(capture_stdout=True, capture_stderr=True)
             )
             
-            print(f"✅ 개선된 자막 포함 비디오 생성 완료: {output_path}")
+            print(f"✅ 자막 트랙 포함 비디오 생성 완료: {output_path}")
             return True
             
         except ffmpeg.Error as e:
-            print(f"❌ 자막 삽입 실패: {e}")
+            print(f"❌ 자막 트랙 추가 실패: {e}")
             if e.stderr:
                 print(f"FFmpeg 오류 세부 정보: {e.stderr.decode('utf-8')}")
             return False
-        except Exception as e:
-            print(f"❌ 예상치 못한 오류: {e}")
-            return False
     
-    def process_video_segment(self, video_path, output_dir=None, start_time=None, end_time=None):
-        """비디오 구간 처리 (구간 지정 가능)"""
+    def _burn_in_subtitles(self, video_path, output_path, subtitle_filter, encoder, audio_options):
+        """지정한 인코더로 자막 필터를 적용해 인코딩 (하드웨어 인코더는 하드웨어 디코딩도 함께 사용)"""
+        print(f"   🎞️  인코더: {encoder}")
+        
+        encoder_options = get_h264_encoder_options(encoder, crf=20, preset='medium')
+        input_options = get_hwaccel_input_options(encoder)
+        video_filter = subtitle_filter
+        
+        if encoder == 'h264_nvenc':
+            # 자막을 그린 프레임을 GPU 메모리로 올려 NVENC에 바로 전달 (픽셀 형식은 업로드된 프레임을 따름)
+            video_filter += ",hwupload_cuda"
+            encoder_options.pop('pix_fmt', None)
+        
+        (
+            ffmpeg
+            .input(video_path, **input_options)
+            .output(
+                output_path,
+                vf=video_filter,
+                **audio_options,
+                **encoder_options
+            )
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    
+    def create_subtitle_file(self, video_path, output_dir=None, start_time=None, end_time=None):
+        """
+        음성 인식 + 번역으로 SRT 자막 파일만 생성 (영상 인코딩 없음)
+        
+        Returns:
+            Path: 생성된 SRT 파일 경로
+        """
+        segment_info = get_segment_suffix(start_time, end_time)
+        
+        # 1-2. 음성 인식과 번역 (인식된 세그먼트부터 바로 번역 요청, 중단되면 다음 실행에서 이어서 진행)
+        journal = self.get_translation_journal(video_path, start_time, end_time)
+        try:
+            segments, translated_texts = self.transcribe_and_translate(video_path, start_time, end_time, journal=journal)
+        finally:
+            journal.close()
+        
+        # 3. 개선된 SRT 파일 생성
+        task_name = f"improved_subtitles{segment_info}"
+        srt_path = get_output_path(video_path, task_name, "srt", output_dir)
+        self.create_improved_srt_file(segments, translated_texts, srt_path)
+        
+        # 자막 파일이 만들어졌으므로 진행 기록 삭제
+        journal.remove()
+        return srt_path
+    
+    def process_video_segment(self, video_path, output_dir=None, start_time=None, end_time=None, burn_subtitles=False):
+        """
+        비디오 구간 처리 (구간 지정 가능)
+        
+        Args:
+            burn_subtitles: True이면 자막을 영상에 직접 새김 (전체 재인코딩),
+                            False이면 재인코딩 없이 mov_text 자막 트랙으로 추가
+        """
         # 입력 파일 검증
         if not validate_input_format(video_path):
             print(f"❌ 지원되지 않는 파일 형식: {Path(video_path).suffix}")
@@ -260,21 +917,17 @@ class ImprovedSubtitleGenerator:
         
         print(f"🚀 개선된 비디오 자막 생성 시작: {video_file.name}{segment_info}")
         
-        # 1. 음성 인식
-        transcription = self.transcribe_audio(video_path, start_time, end_time)
-        
-        # 2. 번역
-        source_texts = [segment['text'] for segment in transcription['segments']]
-        translated_texts = self.translate_text_batch(source_texts)
-        
-        # 3. 개선된 SRT 파일 생성
+        # 1-3. 음성 인식, 번역, SRT 파일 생성
+        srt_path = self.create_subtitle_file(video_path, output_dir, start_time, end_time)
         task_name = f"improved_subtitles{segment_info}"
-        srt_path = get_output_path(video_path, task_name, "srt", output_dir)
-        self.create_improved_srt_file(transcription['segments'], translated_texts, srt_path)
         
-        # 4. 개선된 자막 포함 비디오 생성
+        # 4. 개선된 자막 포함 비디오 생성 (스타일이 들어간 ASS 사용)
+        ass_path = srt_path.with_suffix('.ass')
         output_video_path = get_output_path(video_path, task_name, "mp4", output_dir)
-        success = self.embed_improved_subtitles_to_video(video_path, srt_path, output_video_path)
+        if burn_subtitles:
+            success = self.embed_improved_subtitles_to_video(video_path, ass_path, output_video_path)
+        else:
+            success = self.embed_soft_subtitles(video_path, ass_path, output_video_path)
         
         if success:
             print(f"\n🎉 완료! 개선된 자막 포함 비디오: {output_video_path}")
@@ -283,17 +936,46 @@ class ImprovedSubtitleGenerator:
             print(f"\n📄 SRT 파일만 생성됨: {srt_path}")
             return srt_path
 
+    def restyle_video(self, video_path, output_dir=None, start_time=None, end_time=None):
+        """
+        이전 실행에서 만든 SRT로 ASS를 다시 만들고 자막 트랙만 교체 (스타일 조정용)
+        음성 인식, 번역, 영상 인코딩을 모두 건너뛰므로 긴 영상도 수 초 안에 끝남
+        
+        Returns:
+            Path: 생성된 비디오 경로 (SRT가 없거나 실패하면 None)
+        """
+        task_name = f"improved_subtitles{get_segment_suffix(start_time, end_time)}"
+        srt_path = get_output_path(video_path, task_name, "srt", output_dir)
+        if not srt_path.exists():
+            print(f"❌ 스타일을 적용할 SRT 파일이 없습니다: {srt_path}")
+            return None
+        
+        print(f"🎨 자막 스타일 다시 적용: {SUBTITLE_FORCE_STYLE}")
+        ass_path = self.create_ass_file(self.read_srt_entries(srt_path), srt_path.with_suffix('.ass'))
+        
+        output_video_path = get_output_path(video_path, task_name, "mp4", output_dir)
+        if self.embed_soft_subtitles(video_path, ass_path, output_video_path):
+            return output_video_path
+        return None
+
 def main():
+    # 명령행 옵션: --burn 지정 시 자막을 영상에 직접 새김 (기본: 재인코딩 없는 자막 트랙)
+    #             --style-only 지정 시 이미 만든 SRT로 스타일만 다시 적용 (음성 인식/번역/인코딩 없음)
+    burn_subtitles = '--burn' in sys.argv
+    style_only = '--style-only' in sys.argv
+    
     # OpenAI API 키 설정 (환경변수에서 읽기)
     api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
+    if not api_key and not style_only:
         print("⚠️ OPENAI_API_KEY 환경변수를 설정해주세요.")
         print("export OPENAI_API_KEY=your_api_key_here")
         return
     
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
     # 비디오 파일 경로 설정 (명령행 인자 또는 환경변수)
-    if len(sys.argv) > 1:
-        video_path = sys.argv[1]
+    if args:
+        video_path = args[0]
     else:
         video_path = get_default_input_path()
     
@@ -319,7 +1001,12 @@ def main():
     
     # 개선된 자막 생성기 실행
     generator = ImprovedSubtitleGenerator(api_key)
-    result = generator.process_video_segment(video_path, start_time=start_time, end_time=end_time)
+    if style_only:
+        result = generator.restyle_video(video_path, start_time=start_time, end_time=end_time)
+        print(f"\n✅ 작업 완료: {result}")
+        return
+    
+    result = generator.process_video_segment(video_path, start_time=start_time, end_time=end_time, burn_subtitles=burn_subtitles)
     
     print(f"\n✅ 작업 완료: {result}")
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+EasyOCR 상주 서버
+모델을 한 번만 로드해 두고 여러 번의 실행(CLI 반복 실행, 작업자 프로세스 등)이 함께 사용
+프레임은 공유 메모리로 넘겨 큰 이미지를 pickle로 복사하지 않음 (같은 머신 전용)
+
+실행:
+    python ocr_server.py            # OCR_SERVER_ADDRESS (기본 127.0.0.1:6019)에서 대기
+    OCR_SERVER_ADDRESS=/tmp/ocr.sock python ocr_server.py   # 유닉스 소켓
+
+인증 키:
+    연결된 클라이언트가 보낸 메시지는 pickle로 복원되므로 키를 아는 쪽은 서버에서 코드를 실행할 수 있습니다.
+    OCR_SERVER_AUTHKEY를 설정하지 않으면 서버가 시작할 때 무작위 키를 만들어
+    CACHE_DIR/ocr_server.key (소유자만 읽기 가능)에 저장하고, 같은 사용자의 클라이언트가 이 파일을 읽습니다.
+"""
+
+import torch_env
+import os
+import secrets
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Listener, Client
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+import numpy as np
+from file_utils import get_file_config, ensure_directory_exists
+
+# 서버 주소 ("호스트:포트" 또는 유닉스 소켓 경로)
+DEFAULT_OCR_SERVER_ADDRESS = '127.0.0.1:6019'
+
+# 서버가 만든 인증 키 파일 이름 (CACHE_DIR 아래)
+OCR_SERVER_KEY_FILENAME = 'ocr_server.key'
+
+def get_ocr_server_key_path():
+    """서버가 만든 인증 키 파일 경로"""
+    return Path(get_file_config()['cache_dir']) / OCR_SERVER_KEY_FILENAME
+
+def create_ocr_server_authkey():
+    """
+    서버용 인증 키 (OCR_SERVER_AUTHKEY가 없으면 무작위 키를 만들어 소유자 전용 파일에 저장)
+
+    Returns:
+        bytes: 인증 키
+    """
+    authkey = os.getenv('OCR_SERVER_AUTHKEY')
+    if authkey:
+        return authkey.encode('utf-8')
+
+    key_path = get_ocr_server_key_path()
+    ensure_directory_exists(key_path.parent)
+    authkey = secrets.token_hex(32)
+    key_path.unlink(missing_ok=True)
+    # 다른 사용자가 읽지 못하도록 처음부터 0600으로 생성
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(authkey)
+    print(f"🔑 OCR_SERVER_AUTHKEY가 없어 무작위 인증 키를 만들었습니다: {key_path}")
+    return authkey.encode('utf-8')
+
+def load_ocr_server_authkey():
+    """
+    클라이언트용 인증 키 (OCR_SERVER_AUTHKEY, 없으면 서버가 만든 키 파일)
+
+    Returns:
+        bytes 또는 None: 인증 키를 찾지 못하면 None
+    """
+    authkey = os.getenv('OCR_SERVER_AUTHKEY')
+    if authkey:
+        return authkey.encode('utf-8')
+    try:
+        return get_ocr_server_key_path().read_text(encoding='utf-8').strip().encode('utf-8')
+    except OSError:
+        return None
+
+def parse_ocr_server_address(address):
+    """
+    주소 문자열을 multiprocessing.connection 주소로 변환
+
+    Returns:
+        tuple 또는 str: ("호스트", 포트) 또는 유닉스 소켓 경로
+    """
+    host, separator, port = address.rpartition(':')
+    if separator and port.isdigit() and '/' not in address:
+        return (host or '127.0.0.1', int(port))
+    return address
+
+def create_ocr_reader(languages):
+    """
+    사용 가능한 가장 빠른 장치에 EasyOCR Reader 생성
+    (CUDA > Apple Silicon MPS > CPU, CPU에서는 quantize=True로 동적 int8 양자화)
+
+    Returns:
+        tuple: (easyocr.Reader, 장치 이름)
+    """
+    import easyocr
+    import torch
+
+    if torch.cuda.is_available():
+        device = 'cuda'
+        torch.backends.cudnn.benchmark = True
+    elif torch.backends.mps.is_available():
+        device = 'mps'
+    else:
+        device = 'cpu'
+
+    reader = easyocr.Reader(
+        languages,
+        gpu=device if device != 'cpu' else False,
+        quantize=True,
+        cudnn_benchmark=device == 'cuda',
+        model_storage_directory=os.getenv('EASYOCR_MODEL_DIR')
+    )
+    return reader, device
+
+def _attach_shared_memory(name):
+    """클라이언트가 만든 공유 메모리에 연결 (해제는 클라이언트가 담당)"""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.12 이하: 연결만 해도 resource tracker에 등록되어 종료 시 삭제되므로 등록 해제
+        shared_memory = SharedMemory(name=name)
+        resource_tracker.unregister(shared_memory._name, 'shared_memory')
+        return shared_memory
+
+class OCRClient:
+    """
+    OCR 서버에 요청하는 클라이언트 (easyocr.Reader.readtext와 같은 인터페이스)
+    스레드마다 별도 연결을 사용하므로 프레임 처리 스레드 풀에서 그대로 공유 가능
+    """
+
+    def __init__(self, address, authkey):
+        self.address = parse_ocr_server_address(address)
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _get_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = Client(self.address, authkey=self.authkey)
+            self._local.connection = connection
+        return connection
+
+    def _request(self, message):
+        connection = self._get_connection()
+        connection.send(message)
+        status, payload = connection.recv()
+        if status != 'ok':
+            raise RuntimeError(f"OCR 서버 오류: {payload}")
+        return payload
+
+    def ping(self):
+        """서버 연결 확인 (서버의 OCR 언어 목록 반환)"""
+        return self._request({'command': 'ping'})
+
+    def readtext(self, image, **options):
+        """
+        프레임을 공유 메모리로 넘겨 서버에서 OCR 실행
+
+        Returns:
+            list: easyocr readtext 결과 [(bbox, text, confidence), ...]
+        """
+        image = np.ascontiguousarray(image)
+        shared_memory = SharedMemory(create=True, size=max(image.nbytes, 1))
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=shared_memory.buf)[...] = image
+            return self._request({
+                'command': 'readtext',
+                'name': shared_memory.name,
+                'shape': image.shape,
+                'dtype': image.dtype.str,
+                'options': options,
+            })
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+
+def _handle_connection(reader, languages, connection):
+    """클라이언트 연결 하나의 요청을 연결이 끊길 때까지 처리"""
+    with connection:
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                return
+
+            try:
+                if message['command'] == 'ping':
+                    connection.send(('ok', languages))
+                    continue
+
+                shared_memory = _attach_shared_memory(message['name'])
+                try:
+                    image = np.ndarray(message['shape'], dtype=np.dtype(message['dtype']), buffer=shared_memory.buf)
+                    results = reader.readtext(image, **message['options'])
+                    del image
+                finally:
+                    shared_memory.close()
+                connection.send(('ok', results))
+            except (EOFError, OSError):
+                return
+            except Exception as e:
+                connection.send(('error', repr(e)))
+
+def serve(address, languages):
+    """EasyOCR 모델을 로드하고 연결마다 스레드 하나로 요청 처리"""
+    authkey = create_ocr_server_authkey()
+    reader, device = create_ocr_reader(languages)
+    print(f"✅ EasyOCR 초기화 완료: {languages} ({device})")
+
+    with Listener(parse_ocr_server_address(address), authkey=authkey) as listener:
+        print(f"🛰️  OCR 서버 대기 중: {address}")
+        while True:
+            try:
+                connection = listener.accept()
+            except Exception as e:
+                # 인증 실패 등 잘못된 연결은 무시하고 계속 대기
+                print(f"⚠️  연결 거부: {e}")
+                continue
+            threading.Thread(
+                target=_handle_connection,
+                args=(reader, languages, connection),
+                daemon=True
+            ).start()
+
+def main():
+    address = os.getenv('OCR_SERVER_ADDRESS', DEFAULT_OCR_SERVER_ADDRESS)
+    languages = [lang.strip() for lang in os.getenv('OCR_LANGUAGES', 'ja,en').split(',')]
+
+    try:
+        serve(address, languages)
+    except KeyboardInterrupt:
+        print("\n👋 OCR 서버 종료")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
 import sys
 import os
+import math
+import time
 from pathlib import Path
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.append(str(Path(__file__).parent))
 
-from improved_subtitle_generator import ImprovedSubtitleGenerator
+from improved_subtitle_generator import ImprovedSubtitleGenerator, SUBTITLE_FORCE_STYLE
 from improved_screen_translator import ImprovedScreenTextTranslator
+from ffmpeg_utils import get_video_duration
+from whisper_utils import WHISPER_WINDOW_SECONDS, get_transcription_worker_count
 
-def process_full_video():
-    """전체 96분 영상에 개선된 시스템 적용"""
+def format_elapsed(seconds):
+    """소요 시간을 "N분 N초" 형식으로 변환"""
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"{minutes}분 {secs:02d}초"
+
+def process_full_video(video_path="/Users/smgu/test_code/video_converter/video.mov"):
+    """전체 영상에 개선된 시스템 적용 (영상 길이는 실행 시 확인)"""
     
     # OpenAI API 키 설정 (환경변수에서 읽기)
     api_key = os.getenv('OPENAI_API_KEY')
@@ -19,53 +28,69 @@ def process_full_video():
         print("export OPENAI_API_KEY=your_api_key_here")
         return None
     
-    # 원본 비디오 사용
-    video_path = "/Users/smgu/test_code/video_converter/video.mov"
+    # 영상 길이를 한 번만 조회해 처리 계획 결정
+    duration = get_video_duration(video_path)
+    duration_minutes = math.ceil(duration / 60)
+    window_count = max(1, math.ceil(duration / WHISPER_WINDOW_SECONDS))
+    workers = min(get_transcription_worker_count(), window_count)
     
-    print("🚀 전체 96분 영상 개선된 시스템 처리 시작")
+    print(f"🚀 전체 {duration_minutes}분 영상 개선된 시스템 처리 시작")
     print(f"📹 원본 파일: {video_path}")
-    print("⏰ 전체 영상 처리 (96분)")
+    print(f"⏰ 영상 길이: {duration / 60:.1f}분")
+    if workers > 1:
+        print(f"🧩 음성 인식: {WHISPER_WINDOW_SECONDS // 60}분 구간 {window_count}개를 {workers}개 프로세스로 병렬 처리")
+    else:
+        print("🧩 음성 인식: 단일 프로세스 (구간 분할 없음)")
     print("="*80)
+    total_start = time.perf_counter()
     
-    # 1단계: 전체 영상 개선된 음성 자막 생성
+    # 1단계: 전체 영상 개선된 음성 자막 생성 (SRT 파일만, 인코딩은 마지막에 한 번)
     print("\n🎤 1단계: 전체 영상 개선된 음성 자막 생성")
-    print("⚠️  예상 소요 시간: 30-45분 (Whisper 처리 + GPT-4o 번역)")
+    step_start = time.perf_counter()
     
     subtitle_generator = ImprovedSubtitleGenerator(api_key)
-    subtitle_result = subtitle_generator.process_video_segment(
+    subtitle_path = subtitle_generator.create_subtitle_file(
         video_path, 
         start_time=None, 
         end_time=None  # 전체 영상 처리
     )
-    print(f"✅ 전체 음성 자막 완료: {subtitle_result}")
+    print(f"✅ 전체 음성 자막 완료: {subtitle_path} ({format_elapsed(time.perf_counter() - step_start)})")
     
-    # 2단계: 전체 영상 개선된 화면 텍스트 번역
+    # 2단계: 전체 영상 개선된 화면 텍스트 번역 (오버레이만 준비)
     print("\n📺 2단계: 전체 영상 개선된 화면 텍스트 번역")
-    print("⚠️  예상 소요 시간: 60-90분 (OCR 처리 + GPT-4o 번역)")
-    
-    # 음성 자막이 적용된 비디오를 입력으로 사용
-    if str(subtitle_result).endswith('.mp4'):
-        input_for_screen = subtitle_result
-    else:
-        input_for_screen = video_path
+    step_start = time.perf_counter()
     
+    # 자막이 새겨지지 않은 원본에서 OCR 수행
     screen_translator = ImprovedScreenTextTranslator(api_key)
-    final_result = screen_translator.process_video_segment_improved(
-        input_for_screen,
-        "/Users/smgu/test_code/video_converter/video_complete_full_96min.mp4",
+    processed_frames = screen_translator.prepare_overlay_frames(
+        video_path,
         start_time=None,
         end_time=None,  # 전체 영상 처리
         interval_seconds=15  # 15초마다 화면 텍스트 확인
     )
-    print(f"✅ 전체 화면 번역 완료: {final_result}")
+    print(f"✅ 화면 텍스트 번역 준비 완료 ({format_elapsed(time.perf_counter() - step_start)})")
     
-    print("\n🎉 전체 96분 영상 처리 완료!")
+    # 3단계: 음성 자막과 화면 번역 오버레이를 한 번의 인코딩으로 합성
+    print("\n🎬 3단계: 음성 자막 + 화면 번역 합성 (단일 인코딩)")
+    step_start = time.perf_counter()
+    video_file = Path(video_path)
+    final_result = str(video_file.with_name(f"{video_file.stem}_complete_full_{duration_minutes}min.mp4"))
+    screen_translator.create_video_from_processed_frames_improved(
+        video_path,
+        processed_frames,
+        final_result,
+        subtitle_path=subtitle_path,
+        subtitle_style=SUBTITLE_FORCE_STYLE
+    )
+    print(f"✅ 전체 화면 번역 완료: {final_result} ({format_elapsed(time.perf_counter() - step_start)})")
+    
+    print(f"\n🎉 전체 {duration_minutes}분 영상 처리 완료! (총 {format_elapsed(time.perf_counter() - total_start)})")
     print(f"📁 최종 결과: {final_result}")
     print("\n최종 개선사항:")
     print("✅ 음성 자막: 한국어만, 작은 폰트, 긴 자막 분할")
     print("✅ 화면 번역: 향상된 OCR, 더 많은 텍스트 감지, 작은 폰트")
-    print("✅ 원본 화질: video.mov 사용으로 더 선명한 OCR")
-    print("✅ 전체 영상: 96분 완전 처리")
+    print("✅ 원본 화질: 원본 영상 사용으로 더 선명한 OCR")
+    print(f"✅ 전체 영상: {duration_minutes}분 완전 처리")
     
     # 파일 크기 확인
     if os.path.exists(final_result):
@@ -75,4 +100,7 @@ def process_full_video():
     return final_result
 
 if __name__ == "__main__":
-    process_full_video()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        process_full_video(sys.argv[1])
+    else:
+        process_full_video()
@@ -1,13 +1,70 @@
 #!/usr/bin/env python3
 import cv2
-import easyocr
 import openai
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
 import os
+import ffmpeg
 from pathlib import Path
+from multiprocessing import AuthenticationError
 import json
 import time
+import threading
+import asyncio
+import tempfile
+import bisect
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from fractions import Fraction
+from translation_cache import TranslationCache
+from ocr_server import OCRClient, create_ocr_reader, load_ocr_server_authkey
+from file_utils import get_file_config, ensure_directory_exists
+from subtitle_utils import format_ass_timestamps
+from ffmpeg_utils import select_h264_encoder, get_h264_encoder_options, get_hwaccel_input_options, get_mp4_audio_options, get_video_duration, get_keyframe_times, iter_raw_video_frames
+
+# 샘플 프레임을 동시에 처리할 스레드 수 (EasyOCR 추론과 OpenAI 요청은 모두 GIL을 해제)
+FRAME_WORKERS = 8
+
+# 처리를 기다리며 메모리에 둘 수 있는 최대 샘플 프레임 수 (넘으면 디코딩을 잠시 멈춤)
+MAX_PENDING_FRAMES = FRAME_WORKERS * 2
+
+# 번역 오버레이 글자 크기 (영상 픽셀 기준)
+OVERLAY_FONT_SIZE = 20
+
+# 한 번의 번역 요청에 묶을 텍스트 수와 동시에 진행할 최대 요청 수
+TRANSLATION_CHUNK_SIZE = 20
+TRANSLATION_MAX_CONCURRENCY = 8
+
+# OCR 입력 프레임의 최대 긴 변 길이 (더 크면 축소해서 검출, 검출 비용은 픽셀 수에 비례)
+OCR_MAX_DIMENSION = 1280
+
+# Canny 에지 밀도(에지 픽셀 비율 x 255)가 이보다 낮으면 텍스트가 없는 화면으로 보고 OCR 생략
+OCR_MIN_EDGE_DENSITY = 0.05
+
+# dHash 차이가 이 비트 수 이하이면 같은 화면으로 보고 OCR 결과 재사용
+OCR_CACHE_MAX_DISTANCE = 4
+
+# 스트림 복사 조각과 이어붙일 수 있는 원본 H.264 프로필 (ffprobe 프로필 이름 -> libx264 profile)
+CONCAT_H264_PROFILES = {
+    'Constrained Baseline': 'baseline',
+    'Main': 'main',
+    'High': 'high',
+}
+
+# 일본어 문자 범위 (히라가나, 가타카나, 한자) 시작/끝 코드포인트
+JAPANESE_RANGES = [(0x3040, 0x309F), (0x30A0, 0x30FF), (0x4E00, 0x9FAF)]
+
+def _build_codepoint_table(ranges):
+    """BMP 코드포인트별로 범위에 속하면 1인 조회 테이블 (모듈 로드 시 한 번만 생성)"""
+    table = bytearray(0x10000)
+    for start, end in ranges:
+        table[start:end + 1] = b'\x01' * (end - start + 1)
+    return bytes(table)
+
+JAPANESE_CODEPOINT_TABLE = _build_codepoint_table(JAPANESE_RANGES)
+
+def dhash_frame(frame):
+    """프레임의 64비트 차분 해시(dHash)를 정수로 계산 (9x8 그레이 축소 후 인접 픽셀 비교)"""
+    small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (9, 8), interpolation=cv2.INTER_AREA)
+    return int.from_bytes(np.packbits(small[:, 1:] > small[:, :-1]).tobytes(), 'big')
 
 class ScreenTextTranslator:
     def __init__(self, openai_api_key=None, source_language=None, target_language=None, ocr_languages=None):
@@ -21,9 +78,11 @@ class ScreenTextTranslator:
         ocr_lang_str = ocr_languages or os.getenv('OCR_LANGUAGES', 'ja,en')
         ocr_lang_list = [lang.strip() for lang in ocr_lang_str.split(',')]
         
-        # OCR 초기화
-        self.ocr_reader = easyocr.Reader(ocr_lang_list)
-        print(f"✅ EasyOCR 초기화 완료: {ocr_lang_list}")
+        # OCR 초기화 (OCR 서버가 실행 중이면 모델을 다시 로드하지 않고 서버 사용)
+        self.ocr_reader = self._connect_ocr_server(ocr_lang_list)
+        if self.ocr_reader is None:
+            self.ocr_reader, ocr_device = create_ocr_reader(ocr_lang_list)
+            print(f"✅ EasyOCR 초기화 완료: {ocr_lang_list} ({ocr_device})")
         
         # OpenAI 설정
         if openai_api_key:
@@ -33,44 +92,126 @@ class ScreenTextTranslator:
             print("⚠️  OpenAI API 키가 없어 번역 기능이 제한됩니다.")
         
         print(f"🌐 언어 설정: {self.source_language} → {self.target_language}")
+        
+        # 여러 스레드의 진행 상황 출력이 섞이지 않도록 보호
+        self._print_lock = threading.Lock()
+        
+        # 프레임 dHash -> OCR 결과 (정지된 슬라이드 화면은 OCR을 다시 실행하지 않음)
+        self._ocr_cache = {}
+        
+        # 번역 디스크 캐시 (반복되는 슬라이드 제목 등은 실행이 바뀌어도 다시 요청하지 않음)
+        self.translation_cache = TranslationCache()
+    
+    def _connect_ocr_server(self, ocr_lang_list):
+        """
+        OCR_SERVER_ADDRESS가 설정되어 있으면 OCR 서버에 연결
+        
+        Returns:
+            OCRClient 또는 None (설정이 없거나, 연결 실패, 언어 설정이 다르면 None)
+        """
+        address = os.getenv('OCR_SERVER_ADDRESS')
+        if not address:
+            return None
+        
+        authkey = load_ocr_server_authkey()
+        if authkey is None:
+            print("⚠️  OCR 서버 인증 키(OCR_SERVER_AUTHKEY 또는 서버가 만든 키 파일)가 없어 로컬 EasyOCR을 사용합니다.")
+            return None
+        
+        client = OCRClient(address, authkey)
+        try:
+            server_languages = client.ping()
+        except (OSError, EOFError, RuntimeError, AuthenticationError) as e:
+            print(f"⚠️  OCR 서버 연결 실패 ({address}), 로컬 EasyOCR을 사용합니다: {e}")
+            return None
+        
+        if sorted(server_languages) != sorted(ocr_lang_list):
+            print(f"⚠️  OCR 서버 언어({server_languages})가 설정({ocr_lang_list})과 달라 로컬 EasyOCR을 사용합니다.")
+            return None
+        
+        print(f"✅ OCR 서버 연결 완료: {address} {ocr_lang_list}")
+        return client
     
     def extract_frames_with_text_change(self, video_path, interval_seconds=5):
         """비디오에서 일정 간격으로 프레임을 추출"""
         print(f"🎬 비디오에서 프레임 추출 중: {interval_seconds}초 간격")
         
-        cap = cv2.VideoCapture(video_path)
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = total_frames / fps
+        frames_data = list(self.iter_sampled_frames(video_path, interval_seconds))
+        print(f"✅ 총 {len(frames_data)}개 프레임 추출 완료")
+        return frames_data
+    
+    def iter_sampled_frames(self, video_path, interval_seconds=5):
+        """
+        일정 간격의 샘플 프레임을 디코딩되는 대로 하나씩 반환하는 제너레이터
+        
+        Yields:
+            dict: {'frame_number', 'timestamp', 'frame'}
+        """
+        # 비디오 정보 확인
+        probe = ffmpeg.probe(str(video_path))
+        video_stream = next(stream for stream in probe['streams'] if stream['codec_type'] == 'video')
+        width = int(video_stream['width'])
+        height = int(video_stream['height'])
+        fps = float(Fraction(video_stream['r_frame_rate']))
         
-        frames_data = []
-        frame_interval = fps * interval_seconds
+        # fps 필터로 샘플 프레임만 골라 raw BGR로 파이프 출력
+        # (round='up'이면 각 출력 칸에 k*interval초 시점의 프레임이 들어감, 기본값 near는 간격의 절반만큼 늦은 프레임)
+        # (하드웨어 인코더가 있는 환경이면 같은 장치의 디코더(NVDEC, VideoToolbox 등)로 디코딩)
+        stream = (
+            ffmpeg
+            .input(str(video_path), **get_hwaccel_input_options(select_h264_encoder()))
+            .filter('fps', fps=f"1/{interval_seconds}", round='up')
+        )
         
-        for frame_num in range(0, total_frames, frame_interval):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = cap.read()
+        # ffmpeg가 실패하면 iter_raw_video_frames가 stderr와 함께 ffmpeg.Error를 발생
+        for sample_index, frame in enumerate(iter_raw_video_frames(stream, width, height)):
+            timestamp = sample_index * interval_seconds
+            with self._print_lock:
+                print(f"📸 프레임 추출: {timestamp:.1f}초")
             
-            if not ret:
-                break
-                
-            timestamp = frame_num / fps
-            frames_data.append({
-                'frame_number': frame_num,
+            yield {
+                'frame_number': int(round(timestamp * fps)),
                 'timestamp': timestamp,
                 'frame': frame
-            })
-            
-            print(f"📸 프레임 추출: {timestamp:.1f}초")
+            }
+    
+    def find_cached_ocr_result(self, frame_hash):
+        """같거나 거의 같은(해밍 거리 OCR_CACHE_MAX_DISTANCE 이하) 화면의 OCR 결과 조회"""
+        cached = self._ocr_cache.get(frame_hash)
+        if cached is not None:
+            return cached
         
-        cap.release()
-        print(f"✅ 총 {len(frames_data)}개 프레임 추출 완료")
-        return frames_data
+        for cached_hash, cached in list(self._ocr_cache.items()):
+            if bin(frame_hash ^ cached_hash).count('1') <= OCR_CACHE_MAX_DISTANCE:
+                return cached
+        return None
     
     def extract_japanese_text_from_frame(self, frame):
-        """프레임에서 일본어 텍스트 추출"""
+        """
+        프레임에서 일본어 텍스트 추출
+        (에지가 거의 없는 화면은 OCR 생략, 이미 OCR한 화면과 같으면 캐시된 결과 사용)
+        """
+        # 큰 프레임은 축소해서 OCR (오버레이는 원본 프레임에 그리므로 좌표만 원래 크기로 되돌림)
+        height, width = frame.shape[:2]
+        scale = min(1.0, OCR_MAX_DIMENSION / max(height, width))
+        if scale < 1.0:
+            ocr_frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            ocr_frame = frame
+        
+        # 글자가 있는 화면은 에지가 많으므로, 에지 밀도가 낮은 화면(인물 클로즈업, 빈 슬라이드)은 바로 건너뜀
+        edges = cv2.Canny(cv2.cvtColor(ocr_frame, cv2.COLOR_BGR2GRAY), 100, 200)
+        if edges.mean() < OCR_MIN_EDGE_DENSITY:
+            return []
+        
+        frame_hash = dhash_frame(frame)
+        cached = self.find_cached_ocr_result(frame_hash)
+        if cached is not None:
+            return cached
+        
         try:
             # OCR 실행
-            results = self.ocr_reader.readtext(frame, detail=1)
+            results = self.ocr_reader.readtext(ocr_frame, detail=1)
             
             japanese_texts = []
             for (bbox, text, confidence) in results:
@@ -80,10 +221,11 @@ class ScreenTextTranslator:
                     if self.contains_japanese(text):
                         japanese_texts.append({
                             'text': text,
-                            'bbox': bbox,
+                            'bbox': [[x / scale, y / scale] for x, y in bbox],
                             'confidence': confidence
                         })
             
+            self._ocr_cache[frame_hash] = japanese_texts
             return japanese_texts
             
         except Exception as e:
@@ -91,242 +233,471 @@ class ScreenTextTranslator:
             return []
     
     def contains_japanese(self, text):
-        """텍스트에 일본어 문자가 포함되어 있는지 확인"""
-        japanese_ranges = [
-            (0x3040, 0x309F),  # 히라가나
-            (0x30A0, 0x30FF),  # 가타카나  
-            (0x4E00, 0x9FAF),  # 한자
-        ]
-        
-        for char in text:
-            char_code = ord(char)
-            for start, end in japanese_ranges:
-                if start <= char_code <= end:
-                    return True
-        return False
+        """텍스트에 일본어 문자가 포함되어 있는지 확인 (문자마다 조회 테이블 한 번, 찾으면 바로 종료)"""
+        table = JAPANESE_CODEPOINT_TABLE
+        return any(table[code] for code in map(ord, text) if code < 0x10000)
     
     def translate_texts(self, texts):
-        """일본어 텍스트들을 한국어로 번역"""
+        """일본어 텍스트들을 한국어로 번역 (이전에 번역한 텍스트는 디스크 캐시에서 재사용)"""
         if not openai.api_key or not texts:
             return [f"[번역 필요] {text}" for text in texts]
         
+        translations = self.translation_cache.get_many(self.source_language, self.target_language, texts)
+        texts_to_translate = list(dict.fromkeys(text for text in texts if text not in translations))
+        
+        if texts_to_translate:
+            fresh_translations = dict(zip(texts_to_translate, self.translate_uncached_texts(texts_to_translate)))
+            
+            # 실패한 번역은 다음 실행에서 다시 시도하도록 저장하지 않음
+            self.translation_cache.put_many(self.source_language, self.target_language, {
+                text: translation for text, translation in fresh_translations.items()
+                if not translation.startswith("[번역 실패]")
+            })
+            translations.update(fresh_translations)
+        
+        return [translations[text] for text in texts]
+    
+    def translate_uncached_texts(self, texts):
+        """캐시에 없는 텍스트들을 TRANSLATION_CHUNK_SIZE개씩 나눠 동시에 번역 (결과는 입력 순서 유지)"""
         print(f"🌐 {len(texts)}개 텍스트 번역 중...")
         
+        chunks = [texts[i:i + TRANSLATION_CHUNK_SIZE] for i in range(0, len(texts), TRANSLATION_CHUNK_SIZE)]
+        chunk_translations = asyncio.run(self._translate_chunks_async(chunks))
+        translations = [translation for chunk in chunk_translations for translation in chunk]
+        
+        print(f"✅ 번역 완료: {len(translations)}개")
+        return translations
+    
+    async def _translate_chunks_async(self, chunks):
+        # 하나의 클라이언트(HTTP 연결 풀)를 공유하고 동시 요청 수는 세마포어로 제한
+        client = openai.AsyncOpenAI(api_key=openai.api_key)
+        semaphore = asyncio.Semaphore(TRANSLATION_MAX_CONCURRENCY)
+        
+        try:
+            return await asyncio.gather(
+                *(self._translate_chunk_async(client, semaphore, chunk) for chunk in chunks)
+            )
+        finally:
+            await client.close()
+    
+    async def _translate_chunk_async(self, client, semaphore, texts):
+        """텍스트 묶음 하나를 번역 (개수가 맞지 않으면 개별 번역으로 재시도)"""
         try:
             # 배치 번역
             batch_text = "\n---\n".join(texts)
             
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 전문 일본어-한국어 번역가입니다.
-                        화면에 표시된 슬라이드 텍스트를 번역합니다.
-                        기술 용어, 회사명, 고유명사는 적절히 유지하되 자연스러운 한국어로 번역하세요.
-                        각 텍스트는 '---'로 구분되어 있습니다."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"다음 일본어 텍스트들을 한국어로 번역해주세요:\n\n{batch_text}"
-                    }
-                ]
-            )
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": """당신은 전문 일본어-한국어 번역가입니다.
+                            화면에 표시된 슬라이드 텍스트를 번역합니다.
+                            기술 용어, 회사명, 고유명사는 적절히 유지하되 자연스러운 한국어로 번역하세요.
+                            각 텍스트는 '---'로 구분되어 있습니다."""
+                        },
+                        {
+                            "role": "user",
+                            "content": f"다음 일본어 텍스트들을 한국어로 번역해주세요:\n\n{batch_text}"
+                        }
+                    ]
+                )
             
             translated_batch = response.choices[0].message.content
             translations = translated_batch.split("\n---\n")
             
-            # 개수 맞추기
-            if len(translations) != len(texts):
-                print("⚠️  번역 개수 불일치, 개별 번역으로 재시도...")
-                return [self.translate_single_text(text) for text in texts]
-            
-            print(f"✅ 번역 완료: {len(translations)}개")
-            return translations
-            
         except Exception as e:
             print(f"❌ 번역 오류: {e}")
             return [f"[번역 실패] {text}" for text in texts]
+        
+        # 개수 맞추기
+        if len(translations) != len(texts):
+            print("⚠️  번역 개수 불일치, 개별 번역으로 재시도...")
+            return await asyncio.gather(
+                *(self._translate_single_text_async(client, semaphore, text) for text in texts)
+            )
+        
+        return translations
     
-    def translate_single_text(self, text):
-        """단일 텍스트 번역"""
+    async def _translate_single_text_async(self, client, semaphore, text):
+        """단일 텍스트 번역 (비동기)"""
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "일본어를 자연스러운 한국어로 번역하세요."},
-                    {"role": "user", "content": text}
-                ]
-            )
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": "일본어를 자연스러운 한국어로 번역하세요."},
+                        {"role": "user", "content": text}
+                    ]
+                )
             return response.choices[0].message.content
-        except:
+        except Exception:
             return f"[번역 실패] {text}"
     
-    def create_overlay_frame(self, original_frame, text_data_list):
-        """원본 프레임에 번역된 텍스트를 오버레이"""
-        height, width = original_frame.shape[:2]
+    def process_video_with_translation(self, video_path, output_path, interval_seconds=5):
+        """비디오 전체를 처리하여 번역 오버레이 추가"""
+        print(f"🚀 화면 텍스트 번역 비디오 생성 시작: {Path(video_path).name}")
         
-        # 반투명 오버레이 생성
-        overlay = original_frame.copy()
-        overlay_alpha = 0.7
+        # 1~2. 샘플 프레임을 디코딩하는 대로 스레드 풀에 넘겨 OCR + 번역
+        # (처리가 끝난 프레임 이미지는 바로 버리고 텍스트 위치와 번역문만 남기므로
+        #  영상 길이와 관계없이 메모리에는 최대 MAX_PENDING_FRAMES개 프레임만 유지)
+        print(f"🎬 비디오에서 프레임 추출 및 처리 중: {interval_seconds}초 간격")
+        futures = []
+        pending = set()
+        completed = [0]
         
-        # PIL로 변환하여 한글 폰트 처리
-        pil_image = Image.fromarray(cv2.cvtColor(overlay, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(pil_image)
+        def report_progress(_):
+            with self._print_lock:
+                completed[0] += 1
+                print(f"📝 프레임 처리 진행: {completed[0]}/{len(futures)}")
         
-        # 한글 폰트 로드 시도
-        try:
-            # macOS 기본 한글 폰트들 시도
-            font_paths = [
-                "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-                "/System/Library/Fonts/Helvetica.ttc",
-                "/Library/Fonts/Arial Unicode MS.ttf"
-            ]
-            
-            font = None
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    font = ImageFont.truetype(font_path, 20)
-                    break
-            
-            if font is None:
-                font = ImageFont.load_default()
+        with ThreadPoolExecutor(max_workers=FRAME_WORKERS) as executor:
+            for frame_data in self.iter_sampled_frames(video_path, interval_seconds):
+                while len(pending) >= MAX_PENDING_FRAMES:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
                 
-        except:
-            font = ImageFont.load_default()
-        
-        for text_data in text_data_list:
-            bbox = text_data['bbox']
-            korean_text = text_data['korean_text']
-            
-            # 바운딩 박스 좌표 계산
-            x_coords = [point[0] for point in bbox]
-            y_coords = [point[1] for point in bbox]
-            x_min, x_max = min(x_coords), max(x_coords)
-            y_min, y_max = min(y_coords), max(y_coords)
-            
-            # 번역 텍스트를 원본 아래쪽에 배치
-            text_y = y_max + 5
+                future = executor.submit(self._process_single_sampled_frame, frame_data)
+                futures.append(future)
+                pending.add(future)
+                future.add_done_callback(report_progress)
             
-            # 배경 사각형 그리기
-            text_bbox = draw.textbbox((x_min, text_y), korean_text, font=font)
-            draw.rectangle(text_bbox, fill=(0, 0, 0, 180))  # 반투명 검은 배경
-            
-            # 한국어 텍스트 그리기
-            draw.text((x_min, text_y), korean_text, font=font, fill=(255, 255, 255))
+            processed_frames = [future.result() for future in futures]
+        
+        print(f"✅ 총 {len(processed_frames)}개 프레임 처리 완료")
         
-        # PIL에서 OpenCV로 다시 변환
-        result_frame = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        # 3. 처리된 프레임들로 비디오 생성
+        self.create_video_from_processed_frames(video_path, processed_frames, output_path)
         
-        return result_frame
+        return output_path
     
-    def process_video_with_translation(self, video_path, output_path, interval_seconds=5):
-        """비디오 전체를 처리하여 번역 오버레이 추가"""
-        print(f"🚀 화면 텍스트 번역 비디오 생성 시작: {Path(video_path).name}")
+    def _process_single_sampled_frame(self, frame_data):
+        """
+        샘플 프레임 하나의 OCR, 번역, 오버레이 생성
         
-        # 1. 프레임 추출
-        frames_data = self.extract_frames_with_text_change(video_path, interval_seconds)
+        Returns:
+            dict: {'timestamp', 'text_data_list', 'has_translation'} (오버레이는 영상 생성 시 ffmpeg가 그림)
+        """
+        frame = frame_data['frame']
         
-        # 2. 각 프레임에서 텍스트 추출 및 번역
-        processed_frames = []
+        # OCR로 일본어 텍스트 추출
+        japanese_texts = self.extract_japanese_text_from_frame(frame)
         
-        for i, frame_data in enumerate(frames_data):
-            print(f"\n📝 프레임 {i+1}/{len(frames_data)} 처리 중 ({frame_data['timestamp']:.1f}초)")
-            
-            frame = frame_data['frame']
-            
-            # OCR로 일본어 텍스트 추출
-            japanese_texts = self.extract_japanese_text_from_frame(frame)
-            
-            if japanese_texts:
-                print(f"   📖 추출된 일본어 텍스트: {len(japanese_texts)}개")
-                
-                # 텍스트만 추출하여 번역
-                texts_to_translate = [item['text'] for item in japanese_texts]
-                korean_translations = self.translate_texts(texts_to_translate)
-                
-                # 번역 결과를 원본 데이터에 추가
-                text_data_list = []
-                for j, japanese_text_data in enumerate(japanese_texts):
-                    text_data_list.append({
-                        'bbox': japanese_text_data['bbox'],
-                        'japanese_text': japanese_text_data['text'],
-                        'korean_text': korean_translations[j] if j < len(korean_translations) else "[번역 실패]",
-                        'confidence': japanese_text_data['confidence']
-                    })
-                
-                # 오버레이 프레임 생성
-                overlay_frame = self.create_overlay_frame(frame, text_data_list)
-                
-                processed_frames.append({
-                    'timestamp': frame_data['timestamp'],
-                    'frame': overlay_frame,
-                    'has_translation': True
-                })
-                
-                print(f"   ✅ 번역 오버레이 완료")
-                
+        if not japanese_texts:
+            with self._print_lock:
+                print(f"   ⚪ {frame_data['timestamp']:.1f}초: 일본어 텍스트 없음")
+            return {
+                'timestamp': frame_data['timestamp'],
+                'text_data_list': [],
+                'has_translation': False
+            }
+        
+        # 텍스트만 추출하여 번역
+        texts_to_translate = [item['text'] for item in japanese_texts]
+        korean_translations = self.translate_texts(texts_to_translate)
+        
+        # 번역 결과를 원본 데이터에 추가
+        text_data_list = []
+        for j, japanese_text_data in enumerate(japanese_texts):
+            text_data_list.append({
+                'bbox': japanese_text_data['bbox'],
+                'japanese_text': japanese_text_data['text'],
+                'korean_text': korean_translations[j] if j < len(korean_translations) else "[번역 실패]",
+                'confidence': japanese_text_data['confidence']
+            })
+        
+        with self._print_lock:
+            print(f"   ✅ {frame_data['timestamp']:.1f}초: 일본어 텍스트 {len(japanese_texts)}개 번역 완료")
+        
+        return {
+            'timestamp': frame_data['timestamp'],
+            'text_data_list': text_data_list,
+            'has_translation': True
+        }
+    
+    def build_sample_intervals(self, processed_frames, duration):
+        """
+        번역이 있는 샘플별 표시 구간 (각 샘플은 다음 샘플 시각까지 표시)
+        
+        Returns:
+            list: [(시작 초, 끝 초, 처리된 프레임), ...] 시작 시각 순
+        """
+        samples = sorted(processed_frames, key=lambda pframe: pframe['timestamp'])
+        end_times = [pframe['timestamp'] for pframe in samples[1:]] + [duration]
+        return [
+            (pframe['timestamp'], end_time, pframe)
+            for pframe, end_time in zip(samples, end_times)
+            if pframe['has_translation']
+        ]
+    
+    def create_overlay_ass_file(self, sample_intervals, width, height, ass_path):
+        """
+        번역 텍스트를 원문 위치 아래에 표시하는 ASS 자막 파일 생성
+        (각 샘플의 번역은 다음 샘플 시각까지 표시, 좌표는 영상 픽셀 기준)
+        """
+        header = (
+            "[Script Info]\n"
+            "ScriptType: v4.00+\n"
+            f"PlayResX: {width}\n"
+            f"PlayResY: {height}\n"
+            "ScaledBorderAndShadow: yes\n"
+            "\n"
+            "[V4+ Styles]\n"
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+            "Alignment, MarginL, MarginR, MarginV, Encoding\n"
+            # 검은 배경 상자(BorderStyle=3) 위의 흰 글씨
+            f"Style: Overlay,Arial,{OVERLAY_FONT_SIZE},&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,"
+            "0,0,0,0,100,100,0,0,3,2,0,7,0,0,0,1\n"
+            "\n"
+            "[Events]\n"
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        )
+        
+        dialogue_lines = []
+        start_times = format_ass_timestamps([interval[0] for interval in sample_intervals])
+        end_times = format_ass_timestamps([interval[1] for interval in sample_intervals])
+        for (_, _, pframe), start, end in zip(sample_intervals, start_times, end_times):
+            for text_data in pframe['text_data_list']:
+                # 번역 텍스트를 원본 아래쪽에 배치 (왼쪽 위 기준 \an7)
+                points = np.asarray(text_data['bbox'])
+                x_min = int(points[:, 0].min())
+                text_y = int(points[:, 1].max()) + 5
+                korean_text = text_data['korean_text'].strip().replace("\n", "\\N")
+                dialogue_lines.append(
+                    f"Dialogue: 0,{start},{end},Overlay,,0,0,0,,{{\\an7\\pos({x_min},{text_y})}}{korean_text}\n"
+                )
+        
+        with open(ass_path, 'w', encoding='utf-8') as f:
+            f.write(header + "".join(dialogue_lines))
+        return ass_path
+    
+    def merge_overlay_intervals(self, sample_intervals):
+        """
+        샘플 구간 중 맞닿거나 겹치는 구간을 하나로 병합
+        
+        Returns:
+            list: [(시작 초, 끝 초), ...] 시간 순
+        """
+        intervals = []
+        for start, end, _ in sample_intervals:
+            if intervals and start <= intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
             else:
-                print(f"   ⚪ 일본어 텍스트 없음")
-                processed_frames.append({
-                    'timestamp': frame_data['timestamp'],
-                    'frame': frame,
-                    'has_translation': False
-                })
+                intervals.append((start, end))
+        return intervals
+    
+    def _encode_h264(self, input_path, output_path, vf, **output_options):
+        """하드웨어 인코더를 우선 사용하고, 실패하면 libx264로 재시도해 H.264 인코딩"""
+        encoder = select_h264_encoder()
+        for candidate in dict.fromkeys([encoder, 'libx264']):
+            try:
+                (
+                    ffmpeg
+                    .input(str(input_path))
+                    .output(
+                        str(output_path),
+                        vf=vf,
+                        **output_options,
+                        **get_h264_encoder_options(candidate, crf=23, preset='veryfast')
+                    )
+                    .overwrite_output()
+                    .run(capture_stdout=True, capture_stderr=True)
+                )
+                return
+            except ffmpeg.Error as e:
+                if candidate == 'libx264':
+                    print(f"❌ 오버레이 비디오 생성 실패: {e.stderr.decode('utf-8', errors='ignore') if e.stderr else e}")
+                    raise
+                print(f"⚠️  {candidate} 인코딩 실패, libx264로 재시도...")
+    
+    def get_overlay_split_times(self, intervals, keyframe_times, duration):
+        """
+        스트림 복사로 자를 키프레임 시각 목록
+        (오버레이 구간 앞뒤로 가장 가까운 바깥쪽 키프레임에서 잘라 오버레이 구간 전체가 재인코딩 조각에 들어가도록 함)
+        """
+        split_times = set()
+        for start, end in intervals:
+            before = bisect.bisect_right(keyframe_times, start) - 1
+            if before >= 0 and keyframe_times[before] > 0:
+                split_times.add(keyframe_times[before])
+            after = bisect.bisect_left(keyframe_times, end)
+            if after < len(keyframe_times) and keyframe_times[after] < duration:
+                split_times.add(keyframe_times[after])
+        return sorted(split_times)
+    
+    def get_concat_encoder_options(self, video_stream):
+        """
+        스트림 복사 조각과 이어붙일 재인코딩 조각용 libx264 옵션
+        (원본 H.264의 프로필/레벨/픽셀 포맷/타임베이스에 맞춤)
         
-        # 3. 처리된 프레임들로 비디오 생성
-        self.create_video_from_processed_frames(video_path, processed_frames, output_path)
+        Returns:
+            dict 또는 None: 원본 설정에 맞출 수 없으면 None (전체 재인코딩)
+        """
+        if video_stream.get('codec_name') != 'h264' or video_stream.get('pix_fmt') != 'yuv420p':
+            return None
+        profile = CONCAT_H264_PROFILES.get(video_stream.get('profile'))
+        level = int(video_stream.get('level') or 0)
+        numerator, _, denominator = str(video_stream.get('time_base', '')).partition('/')
+        if profile is None or level < 10 or numerator != '1' or not denominator.isdigit():
+            return None
         
-        return output_path
+        options = {
+            'vcodec': 'libx264',
+            'profile:v': profile,
+            'level:v': f"{level // 10}.{level % 10}",
+            'pix_fmt': 'yuv420p',
+            'video_track_timescale': int(denominator),
+            'crf': 23,
+            'preset': 'veryfast',
+        }
+        # 원본에 B프레임이 없으면 재인코딩 조각도 B프레임 없이 (디코더 재정렬 지연을 맞춤)
+        if int(video_stream.get('has_b_frames', 0)) == 0:
+            options['bf'] = 0
+        return options
     
-    def create_video_from_processed_frames(self, original_video_path, processed_frames, output_path):
-        """처리된 프레임들로 새 비디오 생성"""
-        print("🎬 번역 오버레이 비디오 생성 중...")
+    def _matches_concat_source(self, piece_path, video_stream):
+        """재인코딩 조각이 원본과 같은 H.264 설정으로 만들어졌는지 확인"""
+        piece_stream = ffmpeg.probe(str(piece_path), select_streams='v:0')['streams'][0]
+        return all(
+            str(piece_stream.get(key)) == str(video_stream.get(key))
+            for key in ('codec_name', 'profile', 'level', 'pix_fmt', 'width', 'height', 'time_base')
+        )
+    
+    def _burn_overlay_ranges(self, original_video_path, video_stream, intervals, split_times, duration, overlay_filter, audio_options, output_path):
+        """
+        오버레이가 있는 구간만 재인코딩하고 나머지는 스트림 복사 후 concat demuxer로 결합
         
-        # 원본 비디오 정보 가져오기
-        cap = cv2.VideoCapture(original_video_path)
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # 비디오 라이터 설정
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-        
-        # 프레임별 오버레이 맵 생성
-        overlay_map = {}
-        for pframe in processed_frames:
-            frame_num = int(pframe['timestamp'] * fps)
-            overlay_map[frame_num] = pframe
-        
-        # 원본 비디오를 순회하며 오버레이 적용
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-        
-        current_overlay = None
-        for frame_num in range(total_frames):
-            ret, frame = cap.read()
-            if not ret:
-                break
+        1. 키프레임에서 스트림 복사로 분할 (디코딩 없음)
+        2. 오버레이와 겹치는 조각만 원래 시간축으로 옮겨 오버레이를 새기고,
+           원본과 같은 프로필/레벨/픽셀 포맷/타임베이스의 libx264로 재인코딩
+        3. 조각들을 무손실 결합하고 원본 오디오를 붙임
+        
+        Returns:
+            bool: 원본 설정에 맞출 수 없거나 조각이 예상대로 나뉘지 않아 처리하지 못했으면 False
+        """
+        encoder_options = self.get_concat_encoder_options(video_stream)
+        if encoder_options is None:
+            return False
+        
+        temp_root = ensure_directory_exists(get_file_config()['temp_dir'])
+        
+        with tempfile.TemporaryDirectory(prefix="overlay_", dir=temp_root) as work_dir:
+            work_dir = Path(work_dir)
+            (
+                ffmpeg
+                .input(str(original_video_path))
+                .output(
+                    str(work_dir / 'seg_%04d.mov'),
+                    map='0:v:0',
+                    c='copy',
+                    f='segment',
+                    segment_times=",".join(f"{t:.6f}" for t in split_times),
+                    reset_timestamps=1
+                )
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+            segments = sorted(work_dir.glob('seg_*.mov'))
+            if len(segments) != len(split_times) + 1:
+                return False
             
-            # 현재 프레임에 적용할 오버레이 확인
-            if frame_num in overlay_map:
-                current_overlay = overlay_map[frame_num]
+            parts = []
+            segment_starts = [0.0] + split_times
+            segment_ends = split_times + [duration]
+            # 조각과 구간이 모두 시간 순이므로 구간 포인터를 앞으로만 옮기며 겹침 확인
+            interval_index = 0
+            for segment, seg_start, seg_end in zip(segments, segment_starts, segment_ends):
+                while interval_index < len(intervals) and intervals[interval_index][1] <= seg_start:
+                    interval_index += 1
+                if interval_index < len(intervals) and intervals[interval_index][0] < seg_end:
+                    # 조각의 타임스탬프는 0부터 시작하므로 오버레이 시간에 맞게 옮겼다가 되돌림
+                    # (하드웨어 인코더는 프로필/레벨을 원본에 맞출 수 없으므로 libx264만 사용)
+                    encoded = work_dir / f"enc_{segment.stem}.mov"
+                    (
+                        ffmpeg
+                        .input(str(segment))
+                        .output(
+                            str(encoded),
+                            vf=f"setpts=PTS+{seg_start:.6f}/TB,{overlay_filter},setpts=PTS-STARTPTS",
+                            an=None,
+                            **encoder_options
+                        )
+                        .overwrite_output()
+                        .run(capture_stdout=True, capture_stderr=True)
+                    )
+                    if not self._matches_concat_source(encoded, video_stream):
+                        print("   ⚠️  재인코딩 조각이 원본 H.264 설정과 달라 전체를 재인코딩합니다.")
+                        return False
+                    segment = encoded
+                parts.append(segment)
             
-            # 오버레이 적용
-            if current_overlay and current_overlay['has_translation']:
-                # 5초간 오버레이 유지 (다음 오버레이까지)
-                output_frame = current_overlay['frame']
-            else:
-                output_frame = frame
+            encoded_count = sum(part.name.startswith('enc_') for part in parts)
+            print(f"   🎞️  조각 {len(parts)}개 중 {encoded_count}개만 재인코딩 (나머지는 스트림 복사)")
             
-            out.write(output_frame)
+            # 모든 조각이 같은 프로필/레벨/픽셀 포맷/타임베이스이고,
+            # concat demuxer가 조각마다 SPS/PPS를 스트림 안에 넣어주므로 (auto_convert) 무손실로 이어붙일 수 있음
+            concat_list = work_dir / 'list.txt'
+            concat_list.write_text(''.join(f"file '{part.name}'\n" for part in parts), encoding='utf-8')
             
-            if frame_num % (fps * 10) == 0:  # 10초마다 진행상황 출력
-                print(f"   📹 처리 중: {frame_num/fps:.1f}초 / {total_frames/fps:.1f}초")
+            video = ffmpeg.input(str(concat_list), f='concat', safe=0).video
+            audio = ffmpeg.input(str(original_video_path))['a:0?']
+            (
+                ffmpeg
+                .output(video, audio, str(output_path), vcodec='copy', movflags='+faststart', **audio_options)
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+        return True
+    
+    def create_video_from_processed_frames(self, original_video_path, processed_frames, output_path):
+        """
+        번역 오버레이를 ASS 자막으로 만들어 ffmpeg로 새김
+        (파이썬에서 프레임을 디코딩/인코딩하지 않고, 오디오도 그대로 유지)
+        
+        원본이 H.264이면 오버레이가 있는 구간만 재인코딩하고 나머지는 스트림 복사하며,
+        번역할 텍스트가 전혀 없으면 재인코딩 없이 그대로 복사합니다.
+        """
+        print("🎬 번역 오버레이 비디오 생성 중...")
+        
+        # 원본 비디오 정보 가져오기
+        probe = ffmpeg.probe(str(original_video_path))
+        video_stream = next(stream for stream in probe['streams'] if stream['codec_type'] == 'video')
+        width = int(video_stream['width'])
+        height = int(video_stream['height'])
+        duration = get_video_duration(original_video_path)
+        audio_options = get_mp4_audio_options(original_video_path)
+        
+        sample_intervals = self.build_sample_intervals(processed_frames, duration)
+        intervals = self.merge_overlay_intervals(sample_intervals)
+        if not intervals:
+            print("   ℹ️  번역된 텍스트가 없어 원본 비디오를 그대로 복사합니다.")
+            (
+                ffmpeg
+                .input(str(original_video_path))
+                .output(str(output_path), vcodec='copy', movflags='+faststart', **audio_options)
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+            print(f"✅ 번역 오버레이 비디오 생성 완료: {output_path}")
+            return
+        
+        output_file = Path(output_path)
+        ass_path = output_file.with_name(f"{output_file.stem}_overlay.ass")
+        self.create_overlay_ass_file(sample_intervals, width, height, ass_path)
+        
+        ass_path_escaped = str(ass_path).replace('\\', '\\\\').replace(':', '\\:')
+        ass_filter = f"ass='{ass_path_escaped}'"
+        
+        # 스트림 복사 조각과 재인코딩 조각을 이어붙이려면 원본 H.264 설정에 맞춰 인코딩할 수 있어야 함
+        split_times = []
+        if self.get_concat_encoder_options(video_stream) is not None:
+            split_times = self.get_overlay_split_times(intervals, get_keyframe_times(original_video_path), duration)
         
-        cap.release()
-        out.release()
+        if not split_times or not self._burn_overlay_ranges(
+            original_video_path, video_stream, intervals, split_times, duration, ass_filter, audio_options, output_path
+        ):
+            self._encode_h264(original_video_path, output_path, ass_filter, **audio_options)
         
         print(f"✅ 번역 오버레이 비디오 생성 완료: {output_path}")
 
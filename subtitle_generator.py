@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
-import whisper
+import asyncio
 import openai
 import json
 import os
 from pathlib import Path
 import ffmpeg
+from translation_cache import TranslationCache
+from whisper_utils import load_whisper_model
+
+# 한 번의 번역 요청에 묶을 문장 수와 동시에 진행할 최대 요청 수
+TRANSLATION_CHUNK_SIZE = 20
+TRANSLATION_MAX_CONCURRENCY = 8
 
 class SubtitleGenerator:
     def __init__(self, openai_api_key=None, source_language=None, target_language=None):
         self.whisper_model = None
         
+        # 번역 디스크 캐시 (같은 영상을 다시 처리하면 API 요청 없이 재사용)
+        self.translation_cache = TranslationCache()
+        
         # 언어 설정 (환경변수에서 기본값 읽기)
         self.source_language = source_language or os.getenv('SOURCE_LANGUAGE', 'ja')
         self.target_language = target_language or os.getenv('TARGET_LANGUAGE', 'Korean')
@@ -22,9 +31,9 @@ class SubtitleGenerator:
         print(f"🌐 언어 설정: {self.source_language} → {self.target_language}")
     
     def load_whisper_model(self, model_size="large"):
-        """Whisper 모델 로드"""
+        """Whisper 모델 로드 (기본: faster-whisper int8, WHISPER_BACKEND로 변경 가능)"""
         print(f"Whisper {model_size} 모델 로딩 중...")
-        self.whisper_model = whisper.load_model(model_size)
+        self.whisper_model = load_whisper_model(model_size)
         print("✅ Whisper 모델 로드 완료")
     
     def transcribe_japanese_audio(self, video_path):
@@ -37,94 +46,169 @@ class SubtitleGenerator:
             video_path,
             language="ja",  # 일본어로 지정
             word_timestamps=True,
-            verbose=True
+            verbose=False
         )
         
         print(f"✅ 음성 인식 완료: {len(result['segments'])}개 세그먼트")
         return result
     
     def translate_text_batch(self, texts):
-        """일본어 텍스트를 한국어로 번역"""
+        """일본어 텍스트를 한국어로 번역 (이전에 번역한 문장은 디스크 캐시에서 재사용)"""
         if not openai.api_key:
             print("⚠️  OpenAI API 키가 없어 번역을 건너뜁니다.")
             return [f"[번역 필요] {text}" for text in texts]
         
+        translations = self.translation_cache.get_many(self.source_language, self.target_language, texts)
+        texts_to_translate = list(dict.fromkeys(text for text in texts if text not in translations))
+        print(f"💾 번역 캐시 적중: {sum(text in translations for text in texts)}/{len(texts)}개")
+        
+        if texts_to_translate:
+            fresh_translations = dict(zip(texts_to_translate, self.translate_uncached_batch(texts_to_translate)))
+            
+            # 실패한 번역은 다음 실행에서 다시 시도하도록 저장하지 않음
+            self.translation_cache.put_many(self.source_language, self.target_language, {
+                text: translation for text, translation in fresh_translations.items()
+                if not translation.startswith("[번역 실패]")
+            })
+            translations.update(fresh_translations)
+        
+        return [translations[text] for text in texts]
+    
+    def translate_uncached_batch(self, texts):
+        """캐시에 없는 문장들을 TRANSLATION_CHUNK_SIZE개씩 나눠 동시에 번역 (결과는 입력 순서 유지)"""
         print("🌐 일본어 → 한국어 번역 중...")
         
-        # 배치로 번역 (비용 절약)
-        batch_text = "\n---\n".join(texts)
+        chunks = [texts[i:i + TRANSLATION_CHUNK_SIZE] for i in range(0, len(texts), TRANSLATION_CHUNK_SIZE)]
+        chunk_translations = asyncio.run(self._translate_chunks_async(chunks))
+        translated_texts = [translation for chunk in chunk_translations for translation in chunk]
+        
+        print(f"✅ 번역 완료: {len(translated_texts)}개 문장")
+        return translated_texts
+    
+    async def _translate_chunks_async(self, chunks):
+        # 하나의 클라이언트(HTTP 연결 풀)를 공유하고 동시 요청 수는 세마포어로 제한
+        client = openai.AsyncOpenAI(api_key=openai.api_key)
+        semaphore = asyncio.Semaphore(TRANSLATION_MAX_CONCURRENCY)
         
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4o",  # 최고 품질 번역
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 전문 일본어-한국어 번역가입니다. 
-                        AI/기술 관련 세미나 발표 내용을 번역합니다.
-                        자연스러운 한국어로 번역하되, 기술 용어는 적절히 유지하세요.
-                        각 문장은 '---'로 구분되어 있습니다."""
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"다음 일본어 텍스트를 한국어로 번역해주세요:\n\n{batch_text}"
-                    }
-                ]
+            return await asyncio.gather(
+                *(self._translate_chunk_async(client, semaphore, chunk) for chunk in chunks)
             )
-            
-            translated_batch = response.choices[0].message.content
-            translated_texts = translated_batch.split("\n---\n")
-            
-            # 원본과 번역본 개수 맞추기
-            if len(translated_texts) != len(texts):
-                print("⚠️  번역 개수가 맞지 않습니다. 개별 번역으로 재시도...")
-                return [self.translate_single_text(text) for text in texts]
-            
-            print(f"✅ 번역 완료: {len(translated_texts)}개 문장")
-            return translated_texts
+        finally:
+            await client.close()
+    
+    def build_batch_messages(self, texts):
+        """
+        JSON 모드 배치 번역 요청 메시지 생성
+        (각 문장에 인덱스 i를 붙여 보내고 같은 인덱스로 돌려받으므로 '---' 구분자 분할 문제가 없음)
+        """
+        payload = json.dumps(
+            {"t": [{"i": i, "text": text} for i, text in enumerate(texts)]},
+            ensure_ascii=False
+        )
+        return [
+            {
+                "role": "system",
+                "content": """당신은 전문 일본어-한국어 번역가입니다. 
+                AI/기술 관련 세미나 발표 내용을 번역합니다.
+                자연스러운 한국어로 번역하되, 기술 용어는 적절히 유지하세요.
+                입력과 같은 i 값을 유지하여 {"t": [{"i": 0, "text": "번역문"}, ...]} 형식의 JSON으로만 응답하세요."""
+            },
+            {
+                "role": "user", 
+                "content": f"다음 일본어 텍스트를 한국어로 번역해주세요:\n\n{payload}"
+            }
+        ]
+    
+    def parse_batch_response(self, content, count):
+        """
+        JSON 모드 응답을 인덱스별 번역으로 변환
+        
+        Returns:
+            list: 길이 count의 번역 목록 (응답에 없는 인덱스는 None)
+        """
+        translations = [None] * count
+        try:
+            items = json.loads(content).get("t", [])
+        except (json.JSONDecodeError, AttributeError):
+            return translations
+        
+        for item in items:
+            try:
+                index = int(item["i"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < count and isinstance(item.get("text"), str):
+                translations[index] = item["text"]
+        return translations
+    
+    async def _translate_chunk_async(self, client, semaphore, texts):
+        """문장 묶음 하나를 JSON 모드로 번역 (응답에 빠진 문장만 개별 번역으로 다시 요청)"""
+        try:
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model="gpt-4o",  # 최고 품질 번역
+                    messages=self.build_batch_messages(texts),
+                    response_format={"type": "json_object"}
+                )
+            translated_texts = self.parse_batch_response(response.choices[0].message.content, len(texts))
             
         except Exception as e:
             print(f"❌ 번역 오류: {e}")
             return [f"[번역 실패] {text}" for text in texts]
+        
+        missing = [i for i, translation in enumerate(translated_texts) if translation is None]
+        if missing:
+            print(f"⚠️  응답에 빠진 번역 {len(missing)}개, 개별 번역으로 재시도...")
+            retried = await asyncio.gather(
+                *(self._translate_single_text_async(client, semaphore, texts[i]) for i in missing)
+            )
+            for i, translation in zip(missing, retried):
+                translated_texts[i] = translation
+        
+        return translated_texts
     
-    def translate_single_text(self, text):
-        """단일 텍스트 번역"""
+    async def _translate_single_text_async(self, client, semaphore, text):
+        """단일 텍스트 번역 (비동기)"""
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "일본어를 자연스러운 한국어로 번역하세요."},
-                    {"role": "user", "content": text}
-                ]
-            )
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": "일본어를 자연스러운 한국어로 번역하세요."},
+                        {"role": "user", "content": text}
+                    ]
+                )
             return response.choices[0].message.content
-        except:
+        except Exception:
             return f"[번역 실패] {text}"
     
     def create_srt_file(self, segments, translations, output_path):
         """SRT 자막 파일 생성"""
         print("📝 SRT 자막 파일 생성 중...")
         
+        # 자막 전체를 문자열로 만든 뒤 한 번에 기록
+        parts = []
+        for i, (segment, translation) in enumerate(zip(segments, translations), 1):
+            start_time = self.seconds_to_srt_time(segment['start'])
+            end_time = self.seconds_to_srt_time(segment['end'])
+            
+            # 이중 자막 (일본어 + 한국어)
+            subtitle_text = f"{segment['text'].strip()}\n{translation.strip()}"
+            
+            parts.append(f"{i}\n{start_time} --> {end_time}\n{subtitle_text}\n\n")
+        
         with open(output_path, 'w', encoding='utf-8') as f:
-            for i, (segment, translation) in enumerate(zip(segments, translations), 1):
-                start_time = self.seconds_to_srt_time(segment['start'])
-                end_time = self.seconds_to_srt_time(segment['end'])
-                
-                # 이중 자막 (일본어 + 한국어)
-                subtitle_text = f"{segment['text'].strip()}\n{translation.strip()}"
-                
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{subtitle_text}\n\n")
+            f.write("".join(parts))
         
         print(f"✅ SRT 파일 생성 완료: {output_path}")
     
     def seconds_to_srt_time(self, seconds):
-        """초를 SRT 시간 형식으로 변환"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millisecs = int((seconds % 1) * 1000)
+        """초를 SRT 시간 형식으로 변환 (정수 밀리초로 반올림한 뒤 divmod로 분해)"""
+        millisecs = int(round(max(seconds, 0) * 1000))
+        hours, millisecs = divmod(millisecs, 3_600_000)
+        minutes, millisecs = divmod(millisecs, 60_000)
+        secs, millisecs = divmod(millisecs, 1000)
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
     
     def embed_subtitles_to_video(self, video_path, srt_path, output_path):
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+자막 시간 형식 변환 유틸리티
+SRT/ASS 자막을 만드는 모든 모듈이 같은 반올림 규칙을 쓰도록 한 곳에서 제공
+"""
+
+import numpy as np
+
+def format_srt_timestamps(seconds):
+    """
+    초 단위 시간 배열을 SRT 시간 문자열(HH:MM:SS,mmm) 목록으로 한 번에 변환
+    (정수 밀리초로 반올림한 뒤 divmod로 분해)
+    """
+    total_ms = np.round(np.maximum(np.asarray(seconds, dtype=np.float64), 0) * 1000).astype(np.int64)
+    total_seconds, millisecs = np.divmod(total_ms, 1000)
+    hours, remainder = np.divmod(total_seconds, 3600)
+    minutes, secs = np.divmod(remainder, 60)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+        for h, m, s, ms in zip(hours.tolist(), minutes.tolist(), secs.tolist(), millisecs.tolist())
+    ]
+
+def format_ass_timestamps(seconds):
+    """초 단위 시간 배열을 ASS 시간 문자열(H:MM:SS.cc) 목록으로 한 번에 변환"""
+    total_cs = np.round(np.maximum(np.asarray(seconds, dtype=np.float64), 0) * 100).astype(np.int64)
+    total_seconds, centisecs = np.divmod(total_cs, 100)
+    hours, remainder = np.divmod(total_seconds, 3600)
+    minutes, secs = np.divmod(remainder, 60)
+    return [
+        f"{h:d}:{m:02d}:{s:02d}.{cs:02d}"
+        for h, m, s, cs in zip(hours.tolist(), minutes.tolist(), secs.tolist(), centisecs.tolist())
+    ]
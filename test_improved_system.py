@@ -37,7 +37,8 @@ def test_improved_system():
     subtitle_result = subtitle_generator.process_video_segment(
         video_path, 
         start_time=start_time, 
-        end_time=end_time
+        end_time=end_time,
+        burn_subtitles=True  # 화면 번역 단계에서 재인코딩되므로 자막을 영상에 새김
     )
     print(f"✅ 음성 자막 완료: {subtitle_result}")
     
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+오버레이 구간만 재인코딩한 조각과 스트림 복사 조각을 이어붙인 결과 디코딩 테스트
+(pytest로 실행하거나 python test_overlay_concat.py로 직접 실행, ffmpeg/ffprobe 필요)
+"""
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import ffmpeg
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent))
+
+from screen_text_translator import ScreenTextTranslator
+from ffmpeg_utils import get_mp4_audio_options, get_video_duration, get_keyframe_times
+
+def _create_source(path, profile, fps):
+    """1초마다 키프레임이 있는 H.264 + AAC 테스트 영상 생성"""
+    subprocess.run([
+        'ffmpeg', '-v', 'error', '-y',
+        '-f', 'lavfi', '-i', f"testsrc2=s=640x360:r={fps}:d=6",
+        '-f', 'lavfi', '-i', 'sine=d=6',
+        '-c:v', 'libx264', '-profile:v', profile, '-pix_fmt', 'yuv420p', '-g', str(fps),
+        '-c:a', 'aac', '-shortest', str(path)
+    ], check=True, capture_output=True)
+
+def _burn_and_decode(profile, fps):
+    # OCR/번역 초기화 없이 오버레이 합성 메서드만 사용
+    translator = ScreenTextTranslator.__new__(ScreenTextTranslator)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = Path(temp_dir) / "source.mp4"
+        output = Path(temp_dir) / "output.mp4"
+        _create_source(source, profile, fps)
+
+        video_stream = ffmpeg.probe(str(source), select_streams='v:0')['streams'][0]
+        duration = get_video_duration(source)
+        intervals = [(2.5, 3.5)]
+        split_times = translator.get_overlay_split_times(intervals, get_keyframe_times(source), duration)
+        assert split_times == [2.0, 4.0]
+
+        overlay_filter = "drawbox=x=20:y=20:w=200:h=60:color=black:t=fill:enable='between(t,2.5,3.5)'"
+        assert translator._burn_overlay_ranges(
+            source, video_stream, intervals, split_times, duration,
+            overlay_filter, get_mp4_audio_options(source), output
+        )
+
+        # 복사 조각과 재인코딩 조각 경계에서 디코딩 오류가 없어야 함
+        result = subprocess.run(
+            ['ffmpeg', '-v', 'error', '-i', str(output), '-f', 'null', '-'],
+            capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stderr == '', result.stderr
+        assert abs(get_video_duration(output) - duration) < 0.1
+
+def test_mixed_concat_decodes_cleanly_high_profile():
+    """B프레임이 있는 High 프로필 원본"""
+    if shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None:
+        print("⚠️  ffmpeg/ffprobe가 없어 테스트를 건너뜁니다.")
+        return
+    _burn_and_decode('high', 25)
+
+def test_mixed_concat_decodes_cleanly_baseline_profile():
+    """B프레임이 없는 Constrained Baseline 원본"""
+    if shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None:
+        print("⚠️  ffmpeg/ffprobe가 없어 테스트를 건너뜁니다.")
+        return
+    _burn_and_decode('baseline', 30)
+
+if __name__ == "__main__":
+    test_mixed_concat_decodes_cleanly_high_profile()
+    test_mixed_concat_decodes_cleanly_baseline_profile()
+    print("✅ 조각 결합 디코딩 테스트 통과")
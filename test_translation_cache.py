@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+번역 진행 기록(TranslationJournal) 이어 하기 테스트
+(pytest로 실행하거나 python test_translation_cache.py로 직접 실행)
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent))
+
+from translation_cache import TranslationJournal
+
+def _segments(ids, source):
+    return [{'id': i, 'start': float(i), 'end': i + 0.5, 'text': f"{source}{i}"} for i in ids]
+
+def _append(journal, ids, source):
+    segments = _segments(ids, source)
+    journal.append(segments, [f"번역 {segment['text']}" for segment in segments])
+
+def test_resume_after_gap_drops_stale_entries():
+    """빈 번호 뒤의 이전 실행 항목은 이어서 한 실행의 항목과 섞이지 않아야 함"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "video.translations.jsonl"
+
+        # 1번째 실행: 5번 번역 실패로 0-4, 6-9만 기록
+        journal = TranslationJournal(path)
+        _append(journal, range(0, 5), "run1-")
+        _append(journal, range(6, 10), "run1-")
+        journal.close()
+
+        # 2번째 실행: 0-4를 재사용하고 5부터 다시 인식해 5-7만 기록한 뒤 중단
+        journal = TranslationJournal(path)
+        resumed = journal.load()
+        assert [entry['id'] for entry in resumed] == [0, 1, 2, 3, 4]
+        _append(journal, range(5, 8), "run2-")
+        journal.close()
+
+        # 3번째 실행: 1번째 실행의 8-9가 앞부분에 섞이면 안 됨
+        resumed = TranslationJournal(path).load()
+        assert [entry['id'] for entry in resumed] == list(range(8))
+        assert [entry['src'] for entry in resumed[5:]] == ["run2-5", "run2-6", "run2-7"]
+
+def test_truncated_last_line_is_dropped():
+    """기록 도중 잘린 마지막 줄은 무시하고 파일에서도 제거"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "video.translations.jsonl"
+
+        journal = TranslationJournal(path)
+        _append(journal, range(3), "run1-")
+        journal.close()
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"id": 3, "start": 3.0, "en')
+
+        journal = TranslationJournal(path)
+        assert [entry['id'] for entry in journal.load()] == [0, 1, 2]
+        _append(journal, [3], "run2-")
+        journal.close()
+
+        assert [entry['src'] for entry in TranslationJournal(path).load()] == ["run1-0", "run1-1", "run1-2", "run2-3"]
+
+if __name__ == "__main__":
+    test_resume_after_gap_drops_stale_entries()
+    test_truncated_last_line_is_dropped()
+    print("✅ 진행 기록 테스트 통과")
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+torch를 불러오기 전에 설정해야 하는 환경변수
+torch를 사용하는 모듈은 다른 import보다 먼저 이 모듈을 import
+"""
+
+import os
+
+# Apple Silicon(MPS)에서 지원되지 않는 연산은 CPU로 대신 실행
+os.environ.setdefault('PYTORCH_ENABLE_MPS_FALLBACK', '1')
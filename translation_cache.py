@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+번역 결과 디스크 캐시
+(소스 언어, 타겟 언어, 원문) 조합별 번역을 SQLite에 저장해 실행 간 재사용
+영상별 진행 기록(JSONL)으로 중단된 자막 생성 이어서 하기
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from file_utils import get_file_config, ensure_directory_exists
+
+# SQLite IN 절 하나에 넣을 최대 키 수 (SQLITE_MAX_VARIABLE_NUMBER 기본값 이하)
+LOOKUP_BATCH_SIZE = 500
+
+def make_translation_key(source_language, target_language, text):
+    """캐시 키 생성: sha256("소스|타겟|원문")"""
+    return hashlib.sha256(f"{source_language}|{target_language}|{text}".encode('utf-8')).hexdigest()
+
+class TranslationCache:
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (None이면 CACHE_DIR/translations.sqlite3)
+        """
+        if db_path is None:
+            cache_dir = ensure_directory_exists(get_file_config()['cache_dir'])
+            db_path = cache_dir / "translations.sqlite3"
+
+        self.db_path = Path(db_path)
+        # 프레임 처리 스레드 풀에서도 공유할 수 있도록 연결 하나를 잠금으로 보호
+        self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    source_language TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get_many(self, source_language, target_language, texts):
+        """
+        캐시된 번역 조회
+
+        Returns:
+            dict: 원문 -> 번역 (캐시에 있는 텍스트만 포함)
+        """
+        keys = {make_translation_key(source_language, target_language, text): text for text in set(texts)}
+        key_list = list(keys)
+        found = {}
+
+        with self._lock:
+            for i in range(0, len(key_list), LOOKUP_BATCH_SIZE):
+                batch = key_list[i:i + LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, translation in rows:
+                    found[keys[key]] = translation
+
+        return found
+
+    def put_many(self, source_language, target_language, translations):
+        """
+        번역 결과 저장 (하나의 트랜잭션으로 일괄 기록)
+
+        Args:
+            translations: 원문 -> 번역 딕셔너리
+        """
+        if not translations:
+            return
+
+        now = time.time()
+        rows = [
+            (make_translation_key(source_language, target_language, text), source_language, target_language, text, translation, now)
+            for text, translation in translations.items()
+        ]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def close(self):
+        """DB 연결 종료"""
+        self.connection.close()
+
+class TranslationJournal:
+    """
+    영상 하나의 자막 생성 진행 기록 (JSONL, 번역 묶음이 끝날 때마다 추가하고 바로 flush)
+    중단된 실행을 다시 시작하면 기록된 세그먼트는 음성 인식과 번역 없이 재사용
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 기록 파일 경로 (예: CACHE_DIR/{영상 이름}.translations.jsonl)
+        """
+        self.path = Path(path)
+        self.file = None
+
+    def load(self):
+        """
+        기록된 세그먼트 읽기
+
+        이어서 하는 실행은 반환된 앞부분 다음 번호부터 다시 기록하므로, 빈 번호 뒤에 남아 있던
+        항목(이전 실행의 다른 구간 경계에서 나온 세그먼트)이나 잘린 줄이 있으면 파일을
+        앞부분만 남기도록 다시 씁니다. 그렇지 않으면 다음 실행에서 새 항목과 섞여 잘못 이어집니다.
+
+        Returns:
+            list: 0번부터 빠짐없이 이어지는 앞부분 항목 ({'id', 'start', 'end', 'src', 'text'}), 번호 순
+        """
+        if not self.path.exists():
+            return []
+
+        entries = {}
+        line_count = 0
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                line_count += 1
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 중단되어 잘린 마지막 줄
+                    continue
+                entries[entry['id']] = entry
+
+        prefix = []
+        while len(prefix) in entries:
+            prefix.append(entries[len(prefix)])
+
+        if line_count != len(prefix):
+            self._rewrite(prefix)
+        return prefix
+
+    def _rewrite(self, entries):
+        """기록 파일을 주어진 항목만 담도록 교체 (임시 파일에 쓴 뒤 이름 변경)"""
+        self.close()
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        os.replace(temp_path, self.path)
+
+    def append(self, segments, translations):
+        """
+        번역이 끝난 세그먼트 기록
+
+        Args:
+            segments: 세그먼트 목록 ('id', 'start', 'end', 'text' 포함)
+            translations: 세그먼트 순서대로 정렬된 번역 목록
+        """
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+
+        self.file.write("".join(
+            json.dumps({
+                'id': segment['id'],
+                'start': segment['start'],
+                'end': segment['end'],
+                'src': segment['text'],
+                'text': translation,
+            }, ensure_ascii=False) + "\n"
+            for segment, translation in zip(segments, translations)
+        ))
+        self.file.flush()
+
+    def close(self):
+        """기록 파일 닫기"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def remove(self):
+        """작업이 끝난 뒤 기록 파일 삭제"""
+        self.close()
+        self.path.unlink(missing_ok=True)
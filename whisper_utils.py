@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Whisper 음성 인식 모델 로딩 유틸리티
+faster-whisper(CTranslate2, int8 양자화)를 우선 사용하고, 없으면 openai-whisper로 대체
+"""
+
+import torch_env
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import torch
+import whisper
+from tqdm import tqdm
+
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# 음성 인식 백엔드: faster-whisper(기본) 또는 openai-whisper
+WHISPER_BACKEND = os.getenv('WHISPER_BACKEND', 'faster-whisper').lower()
+
+# 모델 파일 저장 경로 (비워두면 각 라이브러리 기본 캐시 경로 사용)
+WHISPER_MODEL_DIR = os.getenv('WHISPER_MODEL_DIR') or None
+
+# 한 프로세스 안에서 로드한 모델 재사용 (백엔드, 모델 크기, GPU 번호) → 모델
+_WHISPER_CACHE = {}
+
+# 병렬 음성 인식 시 오디오를 나누는 구간 길이 (초)
+WHISPER_WINDOW_SECONDS = 600
+
+# 병렬 음성 인식 작업 프로세스 수 (비워두면 GPU당 1개)
+WHISPER_WORKERS = os.getenv('WHISPER_WORKERS')
+
+# 작업 프로세스별로 할당된 GPU 번호
+_worker_device_index = 0
+
+# openai-whisper 모델 이름 → faster-whisper 모델 이름
+FASTER_WHISPER_MODEL_NAMES = {
+    'large': 'large-v3',
+}
+
+class FasterWhisperModel:
+    """
+    faster-whisper 모델을 openai-whisper와 같은 transcribe() 인터페이스로 감싼 래퍼
+    (결과를 {'text', 'segments', 'language'} 딕셔너리로 반환)
+    """
+
+    def __init__(self, model_size, device_index=0):
+        if ctranslate2.get_cuda_device_count() > 0:
+            device, default_compute_type = 'cuda', 'int8_float16'
+        else:
+            device, default_compute_type = 'cpu', 'int8'
+        compute_type = os.getenv('WHISPER_COMPUTE_TYPE', default_compute_type)
+
+        self.model = WhisperModel(
+            FASTER_WHISPER_MODEL_NAMES.get(model_size, model_size),
+            device=device,
+            device_index=device_index,
+            compute_type=compute_type,
+            download_root=WHISPER_MODEL_DIR
+        )
+        self.detected_language = None
+        print(f"   ⚡ faster-whisper ({device}:{device_index}, {compute_type})")
+
+    def iter_segments(self, audio, language=None, word_timestamps=False, verbose=None, vad_filter=True, **options):
+        """
+        음성 인식 세그먼트를 디코딩되는 대로 하나씩 반환하는 제너레이터
+
+        Args:
+            audio: 오디오 파일 경로 또는 16kHz float32 numpy 배열
+            language: 음성 언어 코드
+            word_timestamps: 단어별 타임스탬프 포함 여부
+            verbose: True면 인식된 세그먼트를 바로 출력, False면 진행 막대만 표시, None이면 출력 없음
+                     (openai-whisper와 같은 의미)
+            vad_filter: 무음 구간을 건너뛰어 디코딩 시간 단축
+
+        Yields:
+            dict: openai-whisper 결과와 같은 형식의 세그먼트 ({'id', 'start', 'end', 'text', 'words'})
+        """
+        segments, info = self.model.transcribe(
+            audio,
+            language=language,
+            word_timestamps=word_timestamps,
+            vad_filter=vad_filter,
+            **options
+        )
+        self.detected_language = info.language
+
+        # 세그먼트마다 출력하는 대신 오디오 시간 기준 진행 막대 하나만 갱신
+        with tqdm(total=round(info.duration, 2), unit='sec', disable=verbose is not False) as progress:
+            for segment in segments:
+                yield self._to_result_segment(segment, verbose)
+                progress.update(round(min(segment.end, progress.total) - progress.n, 2))
+            progress.update(progress.total - progress.n)
+
+    @staticmethod
+    def _to_result_segment(segment, verbose):
+        """faster-whisper 세그먼트를 openai-whisper 형식의 딕셔너리로 변환"""
+        result_segment = {
+            'id': segment.id,
+            'start': segment.start,
+            'end': segment.end,
+            'text': segment.text,
+        }
+        if segment.words is not None:
+            result_segment['words'] = [
+                {'word': word.word, 'start': word.start, 'end': word.end, 'probability': word.probability}
+                for word in segment.words
+            ]
+
+        if verbose:
+            print(f"[{segment.start:.2f} --> {segment.end:.2f}] {segment.text}")
+
+        return result_segment
+
+    def transcribe(self, audio, language=None, word_timestamps=False, verbose=None, **options):
+        """
+        음성 인식 실행 (iter_segments 결과를 모두 모아 반환)
+
+        Returns:
+            dict: openai-whisper transcribe()와 같은 형식의 결과
+        """
+        result_segments = list(self.iter_segments(
+            audio,
+            language=language,
+            word_timestamps=word_timestamps,
+            verbose=verbose,
+            **options
+        ))
+
+        return {
+            'text': "".join(segment['text'] for segment in result_segments),
+            'segments': result_segments,
+            'language': self.detected_language,
+        }
+
+def get_whisper_device():
+    """
+    openai-whisper 모델을 올릴 장치 선택 (CUDA > Apple Silicon MPS > CPU)
+    CUDA에서는 TF32 행렬 연산도 함께 활성화
+    """
+    if torch.cuda.is_available():
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        return 'cuda'
+    if torch.backends.mps.is_available():
+        return 'mps'
+    return 'cpu'
+
+def load_openai_whisper_model(model_size):
+    """
+    openai-whisper 모델을 GPU(CUDA/MPS)에 직접 로드
+    (transcribe()는 GPU에서 기본으로 fp16 디코딩, MPS 로드가 실패하면 CPU 사용)
+    """
+    device = get_whisper_device()
+    try:
+        model = whisper.load_model(model_size, device=device, download_root=WHISPER_MODEL_DIR)
+    except (RuntimeError, NotImplementedError) as e:
+        if device != 'mps':
+            raise
+        print(f"⚠️  MPS에서 Whisper 로드 실패, CPU를 사용합니다: {e}")
+        device = 'cpu'
+        model = whisper.load_model(model_size, device=device, download_root=WHISPER_MODEL_DIR)
+
+    print(f"   🧠 openai-whisper ({device}, {'fp32' if device == 'cpu' else 'fp16'})")
+    return model
+
+def iter_transcribe_segments(model, audio, **options):
+    """
+    모델 종류와 관계없이 음성 인식 세그먼트를 순서대로 반환
+    (faster-whisper는 디코딩되는 즉시, openai-whisper는 전체 인식이 끝난 뒤 반환)
+    """
+    if isinstance(model, FasterWhisperModel):
+        yield from model.iter_segments(audio, **options)
+    else:
+        yield from model.transcribe(audio, **options)['segments']
+
+def load_whisper_model(model_size="large", device_index=0):
+    """
+    설정된 백엔드로 Whisper 모델 로드
+    (같은 프로세스에서 이미 로드한 모델은 디스크에서 다시 읽지 않고 재사용)
+
+    Args:
+        model_size: 모델 크기 (tiny, base, small, medium, large 등)
+        device_index: 사용할 GPU 번호 (faster-whisper 전용)
+
+    Returns:
+        transcribe(audio, language=..., word_timestamps=..., verbose=...)를 지원하는 모델
+    """
+    backend = WHISPER_BACKEND
+    if backend == 'faster-whisper' and WhisperModel is None:
+        print("⚠️  faster-whisper가 설치되어 있지 않아 openai-whisper를 사용합니다.")
+        backend = 'openai-whisper'
+
+    cache_key = (backend, model_size, device_index)
+    if cache_key in _WHISPER_CACHE:
+        print("   ♻️  로드된 Whisper 모델 재사용")
+        return _WHISPER_CACHE[cache_key]
+
+    if backend == 'faster-whisper':
+        model = FasterWhisperModel(model_size, device_index)
+    else:
+        model = load_openai_whisper_model(model_size)
+
+    _WHISPER_CACHE[cache_key] = model
+    return model
+
+def get_transcription_worker_count():
+    """
+    병렬 음성 인식에 사용할 작업 프로세스 수
+    (GPU마다 1개, CPU만 있으면 1 = 병렬 처리 안 함)
+    
+    GPU 하나에 모델 여러 개를 올리면 여유 메모리가 모자랄 수 있으므로,
+    GPU당 2개 이상은 WHISPER_WORKERS로 직접 지정할 때만 사용합니다.
+    """
+    if WHISPER_WORKERS:
+        return max(1, int(WHISPER_WORKERS))
+    if WHISPER_BACKEND != 'faster-whisper' or WhisperModel is None:
+        return 1
+
+    return max(1, ctranslate2.get_cuda_device_count())
+
+def _init_transcription_worker(device_queue):
+    """작업 프로세스 시작 시 사용할 GPU 번호 할당"""
+    global _worker_device_index
+    _worker_device_index = device_queue.get()
+
+def create_transcription_pool(workers):
+    """
+    병렬 음성 인식용 프로세스 풀 생성 (작업자마다 GPU를 돌아가며 할당)
+
+    CUDA는 fork된 프로세스에서 초기화할 수 없으므로 spawn 방식을 사용합니다.
+    """
+    context = multiprocessing.get_context('spawn')
+    gpu_count = max(1, ctranslate2.get_cuda_device_count()) if WhisperModel is not None else 1
+
+    device_queue = context.SimpleQueue()
+    for worker_index in range(workers):
+        device_queue.put(worker_index % gpu_count)
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_transcription_worker,
+        initargs=(device_queue,)
+    )
+
+def shift_segment_times(segment, offset):
+    """
+    구간 기준 세그먼트 타임스탬프를 원본 기준으로 이동 (단어 타임스탬프 포함, 세그먼트를 직접 수정)
+
+    Returns:
+        dict: 같은 세그먼트
+    """
+    segment['start'] += offset
+    segment['end'] += offset
+    for word in segment.get('words', []):
+        word['start'] += offset
+        word['end'] += offset
+    return segment
+
+def transcribe_window(model_size, audio, offset, **options):
+    """
+    작업 프로세스에서 오디오 구간 하나를 인식 (프로세스별 모델은 첫 호출 시 한 번만 로드)
+
+    Args:
+        model_size: 모델 크기
+        audio: 구간 오디오 (16kHz float32 numpy 배열)
+        offset: 구간 시작 시간 (초, 결과 타임스탬프에 더함)
+
+    Returns:
+        list: 타임스탬프가 조정된 세그먼트 목록
+    """
+    model = load_whisper_model(model_size, device_index=_worker_device_index)
+    return [shift_segment_times(segment, offset) for segment in iter_transcribe_segments(model, audio, **options)]